@@ -9,7 +9,14 @@ Notes:
 """
 from datetime import datetime, timezone
 import json
-import time
+import logging
+import sys
+
+try:
+    import orjson
+    _dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:  # optional; stdlib json prints the same layout
+    _dumps = lambda obj: json.dumps(obj, indent=2).encode()
 
 from server.model.repository import SqliteTleRepository
 from server.service.satellite_service import Sgp4SatelliteService
@@ -32,10 +39,15 @@ def pretty_print_satellite(info: dict):
         "velocity_km_s": info.get("velocity_km_s"),
     }
 
-    print(json.dumps(out, indent=2))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_dumps(out) + b"\n")
+    sys.stdout.flush()
 
 
 def main():
+    # Show the scheduler's progress messages on the console
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(message)s", stream=sys.stdout)
+
     # Example: UofT St. George campus (approx)
     lat_deg = 43.6625
     lon_deg = -79.3950
@@ -43,15 +55,18 @@ def main():
 
     # Set up repository and services
     repo = SqliteTleRepository()
-    scheduler = TleSchedulerService(repo, tle_group="amateur", interval_seconds=3600)
     service = Sgp4SatelliteService(repo)
+    # Each refresh re-propagates the next hour of states in the background
+    scheduler = TleSchedulerService(repo, tle_group="amateur", interval_seconds=3600,
+                                    on_refresh=service.precompute_grid)
 
     # Start scheduler with initial fetch
     print("\nStarting scheduler and fetching initial data...")
     scheduler.start(initial_fetch=True)
 
-    # Let it run for a moment to ensure initial fetch completes
-    time.sleep(2)
+    # Returns as soon as the first fetch is stored (start() usually did it already);
+    # otherwise give the background retry the same 2 s as before and use the DB as-is
+    scheduler.initial_fetch_done.wait(timeout=2)
 
     # Find nearest satellite
     when = datetime.now(timezone.utc)
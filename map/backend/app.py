@@ -1,14 +1,17 @@
 # app.py
-import asyncio, json
+import asyncio
 from datetime import datetime, timezone
+import orjson
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # --- DB: SQLAlchemy async + SQLite ---
 from typing import List
-from sqlalchemy import String, Float, Integer, DateTime, ForeignKey, Text, Index
+from sqlalchemy import String, Float, Integer, BigInteger, ForeignKey, Text, Index, event, insert, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.dialects.sqlite import JSON as SQLITE_JSON  # stored as TEXT
 
 from pathlib import Path
@@ -20,21 +23,18 @@ sys.path.insert(0, str(project_root))
 from server.service.satellite_service import Sgp4SatelliteService
 from server.model.repository import SqliteTleRepository
 
-from datetime import datetime
-
-repo = SqliteTleRepository()
-
-satellite_service = Sgp4SatelliteService(repo)
-
-print(satellite_service)
-
-all_sats = satellite_service.get_all_satellite_states(datetime.now(timezone.utc))
-
-print(all_sats[0:3])
-
 
 DB_URL = "sqlite+aiosqlite:///./pings.db"
 
+# Applied once per pooled connection, so the page cache stays warm between requests
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",       # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",     # 256 MiB
+)
+
 class Base(DeclarativeBase): pass
 
 def derive_mode(answers: list, fallback: str) -> str:
@@ -51,7 +51,7 @@ class Ping(Base):
     __tablename__ = "pings"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     device_id: Mapped[str] = mapped_column(String(64), index=True)
-    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    ts: Mapped[int] = mapped_column(BigInteger, index=True)  # epoch ms, UTC
     lat: Mapped[float] = mapped_column(Float)
     lon: Mapped[float] = mapped_column(Float)
     mode: Mapped[str] = mapped_column(String(8))            # "SOS" | "OK"
@@ -74,64 +74,135 @@ class PingAnswer(Base):
 
     ping: Mapped[Ping] = relationship(back_populates="answers")
 
-engine = create_async_engine(DB_URL, echo=False, future=True)
+# Keep a small pool of long-lived connections instead of reconnecting per request
+engine = create_async_engine(
+    DB_URL, echo=False, future=True,
+    poolclass=AsyncAdaptedQueuePool, pool_size=5, max_overflow=5,
+)
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    cur = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cur.execute(pragma)
+    cur.close()
+
 Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 # --- FastAPI + WebSockets (unchanged behavior) ---
-app = FastAPI()
+class UTCORJSONResponse(ORJSONResponse):
+    """ORJSON response that writes datetimes as UTC 'Z' (naive ones taken as UTC)."""
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z,
+        )
+
+app = FastAPI(default_response_class=UTCORJSONResponse)
+app.state.sat_service = None  # built at startup, never at import
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
-connections: set[WebSocket] = set()
+# Each client gets a bounded outbox drained by its own writer task, so a slow
+# socket never delays the HTTP handler that triggered the broadcast.
+CLIENT_QUEUE_SIZE = 64
+clients: dict[WebSocket, asyncio.Queue] = {}
 
-async def broadcast(payload: dict):
-    dead = []
-    for ws in connections:
+async def _client_writer(ws: WebSocket, outbox: asyncio.Queue):
+    try:
+        while True:
+            await ws.send_text(await outbox.get())
+    except asyncio.CancelledError:
+        raise  # ws_endpoint already cleans up on a normal disconnect
+    except Exception:
+        # Send failed: stop queueing for this client and close its socket so
+        # ws_endpoint's receive loop ends too
+        clients.pop(ws, None)
         try:
-            await ws.send_text(json.dumps(payload))
+            await ws.close()
         except Exception:
-            dead.append(ws)
-    for ws in dead:
-        connections.discard(ws)
-    print(f"[broadcast] sent to {len(connections)} client(s)")
+            pass
 
-def _parse_ts(ts_str: str) -> datetime:
-    # Accept "....Z" or offset form
+async def broadcast(payload: dict):
+    # Encode once for every client; text frames because the map client JSON.parse()s them
+    msg = orjson.dumps(payload).decode()
+    for outbox in clients.values():
+        if outbox.full():
+            outbox.get_nowait()  # drop the oldest message for a client that can't keep up
+        outbox.put_nowait(msg)
+    print(f"[broadcast] queued for {len(clients)} client(s)")
+
+def _parse_ts(ts_str: str) -> int:
+    # Accept "....Z" or offset form; naive times are taken as UTC. Returns epoch ms.
     if ts_str.endswith("Z"):
         ts_str = ts_str[:-1] + "+00:00"
-    return datetime.fromisoformat(ts_str)
+    ts = datetime.fromisoformat(ts_str)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return round(ts.timestamp() * 1000)
+
+def _format_ts(ts_ms: int) -> datetime:
+    # UTC datetime for the response; orjson writes it as ISO "...Z" like the pings clients send
+    return datetime.fromtimestamp(ts_ms / 1000, timezone.utc)
 
 @app.on_event("startup")
 async def _startup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # Rows written before ts became epoch ms hold SQLAlchemy's DATETIME text
+        await conn.execute(text(
+            "UPDATE pings SET ts = CAST(ROUND((julianday(ts) - 2440587.5) * 86400000) AS INTEGER) "
+            "WHERE typeof(ts) = 'text'"
+        ))
     print("[db] ready ./pings.db")
 
+async def _build_sat_service():
+    def build():
+        service = Sgp4SatelliteService(SqliteTleRepository())
+        service.propagate_states()  # warms the parsed-TLE cache
+        return service
+    # Published with a single assignment; readers see None until it is ready
+    app.state.sat_service = await asyncio.to_thread(build)
+    print("[sats] ready")
+
+@app.on_event("startup")
+async def _sats():
+    # Build the satellite service in the background rather than awaiting it,
+    # so startup (and serving pings) doesn't wait on TLE parsing/propagation
+    app.state.sat_service_task = asyncio.create_task(_build_sat_service())
+
 @app.post("/api/pings")
 async def receive_ping(req: Request):
-    data = await req.json()
+    data = orjson.loads(await req.body())
     print("\n--- RECEIVED PING ---", data)
 
     # Persist to DB
     answers = data.get("answers") or []
     if not isinstance(answers, list):
         answers = []
-    async with Session() as session:
-        p = Ping(
-            device_id=str(data.get("deviceId", "")),
-            ts=_parse_ts(str(data.get("ts"))),
-            lat=float(data.get("lat")),
-            lon=float(data.get("lon")),
-            mode=str(data.get("mode", "")),
-            pdop=float(data.get("pdop", 0)),
-            answers_json=answers,
-        )
-        session.add(p)
-        await session.flush()  # get p.id
-        for item in answers:
-            q = str(item.get("q", "")).strip()
-            a = str(item.get("a", "")).strip()
-            session.add(PingAnswer(ping_id=p.id, q=q, a=a))
-        await session.commit()
+    answer_rows = [
+        {"q": str(item.get("q", "")).strip(), "a": str(item.get("a", "")).strip()}
+        for item in answers
+    ]
+    # One transaction: INSERT ... RETURNING for the ping, one executemany for answers
+    async with engine.begin() as conn:
+        ping_id = (
+            await conn.execute(
+                insert(Ping).returning(Ping.id),
+                {
+                    "device_id": str(data.get("deviceId", "")),
+                    "ts": _parse_ts(str(data.get("ts"))),
+                    "lat": float(data.get("lat")),
+                    "lon": float(data.get("lon")),
+                    "mode": str(data.get("mode", "")),
+                    "pdop": float(data.get("pdop", 0)),
+                    "answers_json": answers,
+                },
+            )
+        ).scalar_one()
+        if answer_rows:
+            for row in answer_rows:
+                row["ping_id"] = ping_id
+            await conn.execute(insert(PingAnswer), answer_rows)
 
     # Broadcast unchanged payload
     await broadcast(data)
@@ -140,8 +211,14 @@ async def receive_ping(req: Request):
 @app.get("/api/pings/all")
 async def get_all_pings():
     from sqlalchemy import select, func
-    # subquery: rank rows by ts DESC (then id DESC) within each device
-    ranked = (
+    # latest ts per device; ix_pings_device_ts (device_id, ts) answers this
+    # from the index alone instead of sorting every row through a window
+    latest = (
+        select(Ping.device_id, func.max(Ping.ts).label("max_ts"))
+        .group_by(Ping.device_id)
+        .subquery()
+    )
+    stmt = (
         select(
             Ping.id,
             Ping.device_id,
@@ -151,23 +228,25 @@ async def get_all_pings():
             Ping.mode,
             Ping.pdop,
             Ping.answers_json,
-            func.row_number()
-                .over(partition_by=Ping.device_id, order_by=(Ping.ts.desc(), Ping.id.desc()))
-                .label("rn"),
-        ).subquery()
+        )
+        .join(latest, (Ping.device_id == latest.c.device_id) & (Ping.ts == latest.c.max_ts))
+        .order_by(Ping.device_id.asc(), Ping.id.desc())
     )
 
     async with Session() as session:
-        rows = (
-            await session.execute(
-                select(ranked).where(ranked.c.rn == 1).order_by(ranked.c.device_id.asc())
-            )
-        ).mappings().all()
+        matches = (await session.execute(stmt)).mappings().all()
+
+    # pings sharing the max ts: keep the highest id, as the old ROW_NUMBER() did
+    rows = []
+    for r in matches:
+        if not rows or rows[-1]["device_id"] != r["device_id"]:
+            rows.append(r)
 
-    return [
+    # Returned as a response directly so orjson (not jsonable_encoder) handles datetimes
+    return UTCORJSONResponse([
         {
             "deviceId": r["device_id"],
-            "ts": r["ts"].isoformat(),
+            "ts": _format_ts(r["ts"]),
             "lat": r["lat"],
             "lon": r["lon"],
             "mode": r["mode"],
@@ -175,19 +254,40 @@ async def get_all_pings():
             "answers": r["answers_json"],
         }
         for r in rows
-    ]
+    ])
 
 @app.websocket("/ws")
 async def ws_endpoint(ws: WebSocket):
     await ws.accept()
-    connections.add(ws)
-    print(f"[ws] connected. total={len(connections)}")
-    await ws.send_text('{"type":"hello"}')
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    writer = None
     try:
+        # Registered inside the try so a failed hello still unregisters the client
+        clients[ws] = outbox
+        print(f"[ws] connected. total={len(clients)}")
+        await ws.send_text('{"type":"hello"}')
+        writer = asyncio.create_task(_client_writer(ws, outbox))
+        # The server's websocket ping frames keep the link alive; this loop
+        # only returns when the client disconnects. Incoming frames (text or
+        # binary) are ignored.
         while True:
-            await asyncio.sleep(60)  # keep alive
-    except WebSocketDisconnect:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the writer closed the socket after a failed send
         pass
     finally:
-        connections.discard(ws)
-        print(f"[ws] disconnected. total={len(connections)}")
+        if writer is not None:
+            writer.cancel()
+        clients.pop(ws, None)
+        print(f"[ws] disconnected. total={len(clients)}")
+
+if __name__ == "__main__":
+    import uvicorn
+    # "auto" picks uvloop/httptools when installed (uvloop has no Windows build)
+    # and falls back to asyncio/h11 otherwise.
+    # Pi clients keep one connection open between submits; uvicorn's 5 s default
+    # would close it long before the next ping.
+    uvicorn.run("app:app", host="0.0.0.0", port=4000, loop="auto", http="auto", ws="websockets", workers=1,
+                timeout_keep_alive=300)
@@ -1,5 +1,13 @@
-import json, time, requests
+import functools, json, time, requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_UTC_Z)  # datetimes natively
+except ImportError:  # not in the stock Pi image; stdlib json works the same
+    _dumps = lambda obj: json.dumps(obj, default=lambda o: o.isoformat().replace("+00:00", "Z")).encode()
 
 import pygame
 pygame.init()
@@ -18,9 +26,19 @@ DEFAULT_LAT = 43.7315
 DEFAULT_LON = -79.7624
 DEFAULT_PDOP = 2.9
 
+# Kept-alive connections to the backend, reused by every submit; one per
+# EXECUTOR worker so a concurrent post never has to discard its socket
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0))
+SESSION.headers.update({"Content-Type": "application/json"})
+
 # ====== UI PRIMITIVES ======
 W, H = pygame.display.Info().current_w, pygame.display.Info().current_h
-screen = pygame.display.set_mode((W, H), pygame.FULLSCREEN)
+try:
+    # Frames are paced by clock.tick / event.wait, never by waiting on vsync
+    screen = pygame.display.set_mode((W, H), pygame.FULLSCREEN, vsync=0)
+except TypeError:  # pygame 1.9 (stock Pi image) has no vsync argument
+    screen = pygame.display.set_mode((W, H), pygame.FULLSCREEN)
 pygame.mouse.set_visible(False)
 FONT  = pygame.font.SysFont(None, 40)
 FONT_BIG = pygame.font.SysFont(None, 48)
@@ -30,27 +48,39 @@ ACCENT = (70,130,255)
 OK = (60,180,120)
 ERR = (220,80,80)
 
+@functools.lru_cache(maxsize=256)
+def render_text(text, font, color, bg=None):
+    # Screens only show a handful of distinct strings; rasterise each once,
+    # in the display's pixel format so later blits need no conversion.
+    # Text on a known solid background is pre-blended into an opaque surface.
+    if bg is not None:
+        return font.render(text, True, color, bg).convert()
+    return font.render(text, True, color).convert_alpha()
+
 class Button:
     def __init__(self, rect, label, color):
         self.rect = pygame.Rect(rect)
         self.label = label
         self.color = color
+        # Buttons never change, so rasterise the rounded rect + label once
+        self._surf = pygame.Surface(self.rect.size, pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(self._surf, color, self._surf.get_rect(), border_radius=14)
+        txt = render_text(label, FONT_BIG, (0,0,0))
+        self._surf.blit(txt, txt.get_rect(center=self._surf.get_rect().center))
     def draw(self, surf):
-        pygame.draw.rect(surf, self.color, self.rect, border_radius=14)
-        txt = FONT_BIG.render(self.label, True, (0,0,0))
-        surf.blit(txt, txt.get_rect(center=self.rect.center))
+        surf.blit(self._surf, self.rect)
     def hit(self, pos):
         return self.rect.collidepoint(pos)
 
 def draw_text_center(lines, y, color=FG):
     for i, line in enumerate(lines):
-        txt = FONT_BIG.render(line, True, color)
+        txt = render_text(line, FONT_BIG, color, BG)
         screen.blit(txt, txt.get_rect(center=(W//2, y + i*56)))
 
 def post_payload(answers):
     payload = {
         "deviceId": DEVICE_ID,
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": datetime.now(timezone.utc),
         "lat": DEFAULT_LAT,
         "lon": DEFAULT_LON,
         "mode": "SOS" if answers[0]["a"]=="yes" else "OK",
@@ -58,11 +88,16 @@ def post_payload(answers):
         "answers": answers
     }
     try:
-        r = requests.post(f"{API_BASE}/api/pings", headers={"Content-Type":"application/json"}, data=json.dumps(payload), timeout=3)
+        r = SESSION.post(f"{API_BASE}/api/pings", data=_dumps(payload), timeout=3)
         return r.ok
     except Exception:
         return False
 
+# Submits run on a worker thread so the UI keeps drawing during the round trip;
+# the main loop polls the future each frame.
+EXECUTOR = ThreadPoolExecutor(max_workers=2)
+send_future = None
+
 # ====== APP STATE ======
 q_idx = 0
 answers = []  # list of {"q": "...", "a": "yes|no"}
@@ -93,15 +128,29 @@ def render_review():
     y = 140
     for qa in answers:
         line = f"{qa['q']}  →  {qa['a'].upper()}"
-        txt = FONT.render(line, True, FG)
+        txt = render_text(line, FONT, FG, BG)
         screen.blit(txt, (pad, y))
         y += 44
     btn_send.draw(screen)
 
+def sending_dots():
+    return (pygame.time.get_ticks() // 300) % 4
+
+def render_sending(dots=None):
+    # Only this strip changes while a submit is in flight; returns it for display.update()
+    if dots is None:
+        dots = sending_dots()
+    txt = render_text("Sending" + "." * dots + " " * (3 - dots), FONT_BIG, ACCENT, BG)
+    rect = txt.get_rect(center=(W//2, H//2 - 20))
+    strip = pygame.Rect(0, rect.top, W, rect.height)
+    screen.fill(BG, strip)
+    screen.blit(txt, rect)
+    return strip
+
 def render_status():
     screen.fill(BG)
     if status == "sending":
-        draw_text_center(["Sending…"], H//2 - 20, ACCENT)
+        render_sending()
     elif status == "sent":
         draw_text_center(["Sent successfully"], H//2 - 20, OK)
         btn_reset.draw(screen)
@@ -110,42 +159,71 @@ def render_status():
         btn_send.draw(screen)
 
 mode = "QA"  # "QA" → "REVIEW" → "STATUS"
+dirty = True  # repaint only after a state change
+
+# ====== TAP HANDLERS ======
+def handle_question(pos):
+    global q_idx, mode
+    if btn_yes.hit(pos):
+        answers.append({"q": QUESTIONS[q_idx], "a": "yes"})
+        q_idx += 1
+    elif btn_no.hit(pos):
+        answers.append({"q": QUESTIONS[q_idx], "a": "no"})
+        q_idx += 1
+    if q_idx >= len(QUESTIONS):
+        mode = "REVIEW"
+
+def handle_review(pos):
+    global mode, status, send_future
+    if btn_send.hit(pos):
+        mode = "STATUS"; status = "sending"
+        send_future = EXECUTOR.submit(post_payload, list(answers))
+
+def handle_status(pos):
+    global q_idx, answers, mode, status
+    if status == "sent" and btn_reset.hit(pos):
+        # reset flow
+        q_idx = 0; answers = []; mode = "QA"; status = ""
+
+# One lookup per tap / repaint instead of walking an if/elif chain on `mode`
+RENDERERS = {"QA": render_question, "REVIEW": render_review, "STATUS": render_status}
+HANDLERS = {"QA": handle_question, "REVIEW": handle_review, "STATUS": handle_status}
+
+def render():
+    RENDERERS[mode]()
 
 # ====== MAIN LOOP ======
 while True:
-    for e in pygame.event.get():
+    if send_future is None and not dirty:
+        # Nothing animates between taps, so sleep until the next input event
+        # instead of spinning the loop (event.wait() without a timeout works on pygame 1.9 too)
+        events = [pygame.event.wait()] + pygame.event.get()
+    else:
+        events = pygame.event.get()
+    for e in events:
         if e.type == pygame.QUIT:
             pygame.quit(); raise SystemExit
         if e.type == pygame.KEYDOWN:
             if e.key == pygame.K_q: pygame.quit(); raise SystemExit
         if e.type == pygame.MOUSEBUTTONDOWN:
-            x,y = e.pos
-            if mode == "QA":
-                if btn_yes.hit((x,y)):
-                    answers.append({"q": QUESTIONS[q_idx], "a": "yes"})
-                    q_idx += 1
-                elif btn_no.hit((x,y)):
-                    answers.append({"q": QUESTIONS[q_idx], "a": "no"})
-                    q_idx += 1
-                if q_idx >= len(QUESTIONS):
-                    mode = "REVIEW"
-            elif mode == "REVIEW":
-                if btn_send.hit((x,y)):
-                    mode = "STATUS"; status = "sending"
-                    pygame.display.flip()
-                    ok = post_payload(answers)
-                    status = "sent" if ok else "error"
-            elif mode == "STATUS":
-                if status == "sent" and btn_reset.hit((x,y)):
-                    # reset flow
-                    q_idx = 0; answers = []; mode = "QA"; status = ""
-
-    if mode == "QA":
-        render_question()
-    elif mode == "REVIEW":
-        render_review()
-    else:
-        render_status()
-
-    pygame.display.flip()
-    clock.tick(60)
+            dirty = True
+            HANDLERS[mode](e.pos)
+
+    if send_future is not None and send_future.done():
+        status = "sent" if send_future.result() else "error"
+        send_future = None
+        dirty = True
+
+    if dirty:
+        render()
+        pygame.display.update()
+        dirty = False
+        shown_dots = sending_dots()
+    elif status == "sending":
+        # steady state while sending: push only the animated line, and only
+        # when the dot count moves (one clock read per frame)
+        dots = sending_dots()
+        if dots != shown_dots:
+            pygame.display.update(render_sending(dots))
+            shown_dots = dots
+    clock.tick(30)  # caps the rate while a submit is animating
@@ -13,6 +13,17 @@ Prerequisites:
    Or use gpiozero (alternative):
    sudo apt-get install python3-gpiozero
 
+   On Pi 5 / Bookworm, where RPi.GPIO no longer works, install lgpio instead:
+   sudo apt-get install python3-lgpio
+   lgpio is used whenever it is installed.
+
+   Optional: with the pigpio daemon running (sudo pigpiod), beeps and
+   patterns are clocked out by its DMA engine instead of Python sleeps.
+
+   lgpio or RPi.GPIO configures the pin. On Pi Zero to Pi 4 the on/off edges
+   are then written straight to the GPIO registers through /dev/gpiomem;
+   elsewhere (e.g. Pi 5) they go through the library.
+
 Usage Example:
 -------------
 from buzzer_module import BuzzerManager
@@ -50,8 +61,118 @@ buzzer.startup_sound()      # Startup melody
 
 """
 
+import contextlib
+import functools
+import mmap
+import os
+import queue
+import threading
 import time
-import RPi.GPIO as GPIO
+
+try:
+    import lgpio
+except ImportError:  # not in the stock Pi image; RPi.GPIO is used there
+    lgpio = None
+
+try:
+    import RPi.GPIO as GPIO
+except ImportError:
+    if lgpio is None:
+        raise
+    GPIO = None
+
+_gpio_initialized = False  # RPi.GPIO setmode/setwarnings done
+
+try:
+    import pigpio
+except ImportError:  # optional; beeps are timed from Python without it
+    pigpio = None
+
+
+# BCM283x GPIO register block, as mapped by /dev/gpiomem on Pi Zero to Pi 4.
+# The Pi 5 drives its header through the RP1 chip with a different layout,
+# so the direct-register path is only used on the SoCs listed here.
+GPIOMEM_PATH = "/dev/gpiomem"
+_BCM283X = (b"brcm,bcm2835", b"brcm,bcm2836", b"brcm,bcm2837", b"brcm,bcm2711")
+_GPSET0 = 0x1C  # write 1 << n to drive pin n high
+_GPCLR0 = 0x28  # write 1 << n to drive pin n low
+
+# time.sleep routinely oversleeps by a scheduler tick; stop sleeping this
+# far ahead of a deadline and spin for the rest
+_SPIN_NS = 100_000
+
+
+def _open_gpiomem():
+    """Map the GPIO registers, or return None if this board doesn't allow it."""
+    try:
+        with open("/proc/device-tree/compatible", "rb") as f:
+            compatible = f.read()
+        if not any(soc in compatible for soc in _BCM283X):
+            return None
+        fd = os.open(GPIOMEM_PATH, os.O_RDWR | os.O_SYNC)
+        try:
+            return mmap.mmap(fd, 4096, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+
+
+# Short-short-short, long-long-long, short-short-short
+SOS_PATTERN = (0.1, 0.1, 0.1, 0.3, 0.3, 0.3, 0.1, 0.1, 0.1)
+
+# Silence between beeps in beep_pattern()
+_PATTERN_GAP_NS = 100_000_000
+
+
+@functools.lru_cache(maxsize=32)
+def _pattern_deadlines(pattern):
+    """
+    Offsets (ns from the first edge) at which each beep of `pattern` ends and
+    the next begins, worked out once per distinct pattern. The last beep's
+    next-start is None.
+    """
+    deadlines = []
+    t = 0
+    for duration in pattern:
+        t += int(duration * 1e9)
+        deadlines.append([t, t + _PATTERN_GAP_NS])
+        t += _PATTERN_GAP_NS
+    if deadlines:
+        deadlines[-1][1] = None
+    return tuple(map(tuple, deadlines))
+
+
+def _sleep_until(deadline_ns):
+    """Block until time.monotonic_ns() reaches `deadline_ns`."""
+    remaining = deadline_ns - time.monotonic_ns()
+    if remaining > _SPIN_NS:
+        time.sleep((remaining - _SPIN_NS) / 1e9)
+    while time.monotonic_ns() < deadline_ns:
+        pass
+
+
+@contextlib.contextmanager
+def _rt_scope(priority=80):
+    """
+    Run the block under SCHED_FIFO, pinned to one core, so other tasks can't
+    preempt the beep timing. Needs root (or CAP_SYS_NICE); without it the
+    block simply runs at normal priority.
+    """
+    try:
+        saved = (os.sched_getscheduler(0), os.sched_getparam(0), os.sched_getaffinity(0))
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except (AttributeError, OSError):  # not Linux, or not permitted
+        saved = None
+    if saved is None:
+        yield
+        return
+    try:
+        os.sched_setaffinity(0, {max(saved[2])})
+        yield
+    finally:
+        os.sched_setscheduler(0, saved[0], saved[1])
+        os.sched_setaffinity(0, saved[2])
 
 
 class BuzzerManager:
@@ -80,17 +201,57 @@ class BuzzerManager:
             raise ValueError("buzzer_type must be 'active' or 'passive'")
         self.buzzer_type = buzzer_type
 
-        # Setup GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        GPIO.setup(self.pin, GPIO.OUT)
+        # Setup GPIO: lgpio talks to the gpiochip character device directly
+        # (and is the only option on Pi 5); RPi.GPIO otherwise
+        self._h = None
+        if lgpio is not None:
+            self._h = lgpio.gpiochip_open(0)
+            lgpio.gpio_claim_output(self._h, self.pin, 0)
+        else:
+            global _gpio_initialized
+            if not _gpio_initialized:  # process-wide, so once for all buzzers
+                GPIO.setmode(GPIO.BCM)
+                GPIO.setwarnings(False)
+                _gpio_initialized = True
+            GPIO.setup(self.pin, GPIO.OUT)
+
+        # The pin's function is now output; from here on an edge is a single
+        # 32-bit store to GPSET0/GPCLR0 instead of a library call.
+        self._mm = _open_gpiomem()
+        self._regs = None
+        if self._mm is not None:
+            self._regs = memoryview(self._mm).cast("I")
+            bank = self.pin // 32
+            self._set_idx = _GPSET0 // 4 + bank
+            self._clr_idx = _GPCLR0 // 4 + bank
+            self._mask = 1 << (self.pin % 32)
+
+        # Beeps and patterns become pigpio waveforms when the daemon is up
+        self._pi = None
+        if pigpio is not None:
+            pi = pigpio.pi(show_errors=False)
+            if pi.connected:
+                pi.set_mode(self.pin, pigpio.OUTPUT)
+                self._pi = pi
+            else:
+                pi.stop()
+
+        # Background player for the *_async methods, started on first use
+        self._queue = None
+        self._worker = None
+        self._last_queued = None
 
         # Confirmation message
         print(f"✓ Buzzer initialized on GPIO {self.pin} ({self.buzzer_type})")
 
     def on(self):
         """Turn buzzer on continuously."""
-        GPIO.output(self.pin, GPIO.HIGH)
+        if self._regs is not None:
+            self._regs[self._set_idx] = self._mask
+        elif self._h is not None:
+            lgpio.gpio_write(self._h, self.pin, 1)
+        else:
+            GPIO.output(self.pin, GPIO.HIGH)
 
     # Convenience alias
     def turn_on(self):
@@ -99,7 +260,12 @@ class BuzzerManager:
 
     def off(self):
         """Turn buzzer off."""
-        GPIO.output(self.pin, GPIO.LOW)
+        if self._regs is not None:
+            self._regs[self._clr_idx] = self._mask
+        elif self._h is not None:
+            lgpio.gpio_write(self._h, self.pin, 0)
+        else:
+            GPIO.output(self.pin, GPIO.LOW)
 
     # Convenience alias
     def turn_off(self):
@@ -115,12 +281,31 @@ class BuzzerManager:
             times (int): Number of beeps
             pause (float): Pause between beeps in seconds
         """
-        for i in range(times):
-            self.on()
-            time.sleep(duration)
-            self.off()
-            if i < times - 1:  # Don't pause after last beep
-                time.sleep(pause)
+        if times < 1:
+            return
+        if self._pi is not None:
+            self._play_wave([duration] * times, [pause] * (times - 1) + [0])
+            return
+        # Edges are scheduled against absolute deadlines, so a late wake-up
+        # shortens the next interval instead of stretching the whole sequence
+        on_ns = int(duration * 1e9)
+        pause_ns = int(pause * 1e9)
+        on, off, sleep_until = self.on, self.off, _sleep_until
+        with _rt_scope():
+            t = time.monotonic_ns()
+            on()
+            t += on_ns
+            sleep_until(t)
+            off()
+            # Every later beep is pause-then-beep, so there is no
+            # "last beep?" check inside the loop
+            for _ in range(times - 1):
+                t += pause_ns
+                sleep_until(t)
+                on()
+                t += on_ns
+                sleep_until(t)
+                off()
 
     def beep_custom(self, times, duration, pause=0.1):
         """Convenience wrapper that validates arguments and calls beep.
@@ -156,19 +341,115 @@ class BuzzerManager:
                           e.g., [0.1, 0.1, 0.3] = short, short, long
 
         Example:
-            buzzer.beep_pattern([0.1, 0.1, 0.1, 0.3, 0.3, 0.3, 0.1, 0.1, 0.1])  # SOS
+            buzzer.beep_pattern(SOS_PATTERN)
         """
-        for i, duration in enumerate(pattern):
-            self.on()
-            time.sleep(duration)
-            self.off()
-            if i < len(pattern) - 1:
-                time.sleep(0.1)  # Short pause between beeps
+        if self._pi is not None:
+            self._play_wave(pattern, [_PATTERN_GAP_NS / 1e9] * (len(pattern) - 1) + [0])
+            return
+        schedule = _pattern_deadlines(tuple(pattern))
+        on, off, sleep_until = self.on, self.off, _sleep_until
+        with _rt_scope():
+            t0 = time.monotonic_ns()
+            for off_at, next_at in schedule:
+                on()
+                sleep_until(t0 + off_at)
+                off()
+                if next_at is not None:
+                    sleep_until(t0 + next_at)
+
+    def beep_async(self, duration=0.1, times=1, pause=0.1):
+        """Queue beep() on the background player and return immediately."""
+        self._submit(self.beep, duration, times, pause)
+
+    def beep_pattern_async(self, pattern):
+        """Queue beep_pattern() on the background player and return immediately."""
+        self._submit(self.beep_pattern, tuple(pattern))
+
+    def _submit(self, fn, *args):
+        """
+        Hand a sound to the worker thread. Sounds are dropped rather than
+        blocking the caller when the queue is full, and a request identical
+        to the one still waiting in the queue is coalesced into it.
+        """
+        if self._worker is None:
+            self._queue = queue.Queue(maxsize=4)
+            self._worker = threading.Thread(target=self._play_queued, daemon=True)
+            self._worker.start()
+        item = (fn, args)
+        if item == self._last_queued and not self._queue.empty():
+            return
+        try:
+            self._queue.put_nowait(item)
+            self._last_queued = item
+        except queue.Full:
+            pass
+
+    def _play_queued(self):
+        """Worker loop: play queued sounds one at a time until cleanup()."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"✗ Buzzer playback failed: {e}")
+
+    def _play_wave(self, on_times, off_times):
+        """
+        Play on/off pairs as one pigpio waveform and return when it finishes.
+
+        The edges are timed by the DMA engine, so playback doesn't depend on
+        how promptly Python wakes from sleep.
+
+        Args:
+            on_times (list): Seconds the buzzer sounds, one per beep
+            off_times (list): Seconds of silence after each beep
+        """
+        pi = self._pi
+        mask = 1 << self.pin
+        pulses = []
+        for on_s, off_s in zip(on_times, off_times):
+            pulses.append(pigpio.pulse(mask, 0, int(on_s * 1e6)))
+            pulses.append(pigpio.pulse(0, mask, int(off_s * 1e6)))
+        if not pulses:
+            return
+        pi.wave_add_new()
+        pi.wave_add_generic(pulses)
+        wid = pi.wave_create()
+        try:
+            pi.wave_send_once(wid)
+            while pi.wave_tx_busy():
+                time.sleep(0.01)
+        finally:
+            pi.wave_tx_stop()  # no-op unless interrupted mid-wave
+            pi.wave_delete(wid)
 
     def cleanup(self):
         """Clean up GPIO resources."""
+        if self._worker is not None:
+            self._queue.put(None)  # lets the sound in progress finish
+            self._worker.join()
+            self._worker = None
         self.off()
-        GPIO.cleanup(self.pin)
+        if self._regs is not None:
+            self._regs.release()
+            self._mm.close()
+            self._regs = self._mm = None
+        if self._pi is not None:
+            self._pi.stop()
+            self._pi = None
+        if self._h is not None:
+            lgpio.gpio_free(self._h, self.pin)
+            lgpio.gpiochip_close(self._h)
+            self._h = None
+        else:
+            global _gpio_initialized
+            GPIO.cleanup(self.pin)
+            # RPi.GPIO forgets the numbering mode once its last pin is
+            # cleaned up; have the next buzzer set it again
+            _gpio_initialized = False
         print("✓ Buzzer cleaned up")
 
 
@@ -250,5 +531,6 @@ if __name__ == "__main__":
         try:
             buzzer.cleanup()
         except:
-            GPIO.cleanup()
+            if GPIO is not None:
+                GPIO.cleanup()
         print()
\ No newline at end of file
@@ -12,41 +12,114 @@ Options:
 
 This script will toggle the pin and print actions so you can confirm wiring and
 that the GPIO pin responds.
+
+If the pigpio daemon is running (sudo pigpiod), beeps, patterns and the alarm
+are sent as DMA waveforms, so the edges are timed by hardware rather than by
+time.sleep. Otherwise the pin is toggled from Python through the libgpiod
+character device (python3-libgpiod; no sudo needed for members of the gpio
+group), or with RPi.GPIO when that isn't installed.
 """
 
 import time
 import argparse
 
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
+
+try:
+    import gpiod
+except ImportError:
+    gpiod = None
+
 try:
     import RPi.GPIO as GPIO
 except Exception as e:
-    print("Error importing RPi.GPIO:", e)
-    print("This script must be run on a Raspberry Pi with RPi.GPIO installed.")
-    raise
+    if pigpio is None and gpiod is None:
+        print("Error importing RPi.GPIO:", e)
+        print("This script must be run on a Raspberry Pi with RPi.GPIO installed.")
+        raise
+    GPIO = None
+
+# pigpio connection, set in __main__ when the daemon is reachable
+PI = None
+# libgpiod output line, set in __main__ when pigpio isn't used
+LINE = None
+
+SOS = [0.1, 0.1, 0.1, 0.3, 0.3, 0.3, 0.1, 0.1, 0.1]
+
+
+def write(pin, level):
+    if PI is not None:
+        PI.write(pin, level)
+    elif LINE is not None:
+        LINE.set_value(level)
+    else:
+        GPIO.output(pin, GPIO.HIGH if level else GPIO.LOW)
+
+
+def make_wave(pin, on_off):
+    """Create a pigpio wave from (on_seconds, off_seconds) pairs and return its id."""
+    mask = 1 << pin
+    pulses = []
+    for on_s, off_s in on_off:
+        pulses.append(pigpio.pulse(mask, 0, int(on_s * 1e6)))
+        pulses.append(pigpio.pulse(0, mask, int(off_s * 1e6)))
+    PI.wave_add_new()
+    PI.wave_add_generic(pulses)
+    return PI.wave_create()
+
+
+def wait_wave(wid):
+    try:
+        while PI.wave_tx_busy():
+            time.sleep(0.01)
+    finally:
+        PI.wave_tx_stop()
+        PI.wave_delete(wid)
 
 
 def beep(pin, duration=0.2, times=1, pause=0.1):
+    if PI is not None:
+        if times > 0:
+            wid = make_wave(pin, [(duration, pause)] * (times - 1) + [(duration, 0)])
+            PI.wave_send_once(wid)
+            wait_wave(wid)
+        return
     for i in range(times):
-        GPIO.output(pin, GPIO.HIGH)
+        write(pin, 1)
         time.sleep(duration)
-        GPIO.output(pin, GPIO.LOW)
+        write(pin, 0)
         if i < times - 1:
             time.sleep(pause)
 
 
 def pattern(pin):
     # SOS-style short/long pattern
-    seq = [0.1, 0.1, 0.1, 0.3, 0.3, 0.3, 0.1, 0.1, 0.1]
-    for d in seq:
-        GPIO.output(pin, GPIO.HIGH)
+    if PI is not None:
+        wid = make_wave(pin, [(d, 0.1) for d in SOS])
+        PI.wave_send_once(wid)
+        wait_wave(wid)
+        return
+    for d in SOS:
+        write(pin, 1)
         time.sleep(d)
-        GPIO.output(pin, GPIO.LOW)
+        write(pin, 0)
         time.sleep(0.1)
 
 
 def alarm(pin, duration=3.0):
-    end = time.time() + duration
-    while time.time() < end:
+    if PI is not None:
+        # One 0.3 s beep cycle, repeated by the DMA engine itself
+        loops = max(1, min(0xFFFF, round(duration / 0.3)))
+        wid = make_wave(pin, [(0.15, 0.15)])
+        PI.wave_chain([255, 0, wid, 255, 1, loops & 0xFF, loops >> 8])
+        wait_wave(wid)
+        return
+    # Monotonic, so an NTP or RTC clock step mid-alarm can't cut it short or stretch it
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
         beep(pin, duration=0.15)
         time.sleep(0.15)
 
@@ -62,8 +135,28 @@ if __name__ == '__main__':
     print(f"Using BCM pin {pin}. Make sure your buzzer's negative is connected to GND and positive to this pin via appropriate resistor if needed.")
     print("Note: run with sudo on a Raspberry Pi: sudo python3 buzzer_test.py --pin 17 --test beep")
 
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setup(pin, GPIO.OUT)
+    if pigpio is not None:
+        pi = pigpio.pi(show_errors=False)
+        if pi.connected:
+            PI = pi
+            PI.set_mode(pin, pigpio.OUTPUT)
+            print("Using pigpio waveforms")
+        else:
+            pi.stop()
+    if PI is None and gpiod is not None:
+        try:
+            # libgpiod 1.x API (the version packaged for Raspberry Pi OS)
+            LINE = gpiod.Chip('gpiochip0').get_line(pin)
+            LINE.request(consumer='buzzer_test', type=gpiod.LINE_REQ_DIR_OUT)
+            print("Using libgpiod")
+        except (AttributeError, OSError) as e:
+            print("libgpiod unavailable:", e)
+            LINE = None
+    if PI is None and LINE is None:
+        if GPIO is None:
+            raise SystemExit("pigpiod is not running and neither libgpiod nor RPi.GPIO is usable")
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pin, GPIO.OUT)
 
     try:
         if args.test == 'beep':
@@ -80,10 +173,10 @@ if __name__ == '__main__':
 
         elif args.test == 'onoff':
             print('Turning buzzer ON for 2 seconds...')
-            GPIO.output(pin, GPIO.HIGH)
+            write(pin, 1)
             time.sleep(2)
             print('Turning buzzer OFF')
-            GPIO.output(pin, GPIO.LOW)
+            write(pin, 0)
 
         print('Test complete')
 
@@ -91,6 +184,11 @@ if __name__ == '__main__':
         print('\nTest interrupted')
 
     finally:
-        GPIO.output(pin, GPIO.LOW)
-        GPIO.cleanup()
+        write(pin, 0)
+        if PI is not None:
+            PI.stop()
+        elif LINE is not None:
+            LINE.release()
+        else:
+            GPIO.cleanup()
         print('GPIO cleaned up')
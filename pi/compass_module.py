@@ -40,13 +40,42 @@ For best results, calibrate the magnetometer:
     # Follow on-screen instructions to rotate sensor
 
 """
+import sys
 import time
 import math
+import functools
+import threading
+from collections import deque
+import numpy as np
 import board
 import busio
 from adafruit_lsm303dlh_mag import LSM303DLH_Mag
 from adafruit_lsm303_accel import LSM303_Accel
 
+# Bound once; get_heading runs on every poll of the live display
+_atan2 = math.atan2
+_sin = math.sin
+_cos = math.cos
+_sqrt = math.sqrt
+_degrees = math.degrees
+
+# Compass roses for get_cardinal_direction, clockwise from North
+_DIR8 = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+_DIR16 = (
+    "N", "NNE", "NE", "ENE",
+    "E", "ESE", "SE", "SSE",
+    "S", "SSW", "SW", "WSW",
+    "W", "WNW", "NW", "NNW",
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _compass_template(width):
+    """Parts of get_visual_compass that depend only on the width."""
+    border = '─' * width
+    labels = "N    E    S    W    N"
+    return f"┌{border}┐", f"└{border}┘", labels.center(width), '-' * width
+
 
 class CompassManager:
     """
@@ -56,12 +85,17 @@ class CompassManager:
     and raw magnetometer data from the Adafruit 10-DOF IMU breakout.
     """
 
-    def __init__(self, calibration_offset=(0, 0, 0)):
+    def __init__(self, calibration_offset=(0, 0, 0), max_age=0.1, poll_hz=None):
         """
         Initialize the compass manager.
 
         Args:
             calibration_offset (tuple): (x, y, z) calibration offsets for magnetometer
+            max_age (float): Seconds a sensor reading is reused before the I2C
+                bus is read again (0 reads on every call)
+            poll_hz (float): If set, a background thread reads both sensors
+                at this rate and the getters never wait on I2C; call
+                cleanup() to stop it
 
         Raises:
             RuntimeError: If sensors cannot be initialized
@@ -80,8 +114,25 @@ class CompassManager:
             self.cal_offset_z = calibration_offset[2]
 
             # For heading stability detection
-            self.previous_readings = []
             self.stability_window = 5
+            self.previous_readings = deque(maxlen=self.stability_window)  # oldest drops off
+
+            # Recent readings as (time.monotonic(), value). The sensors update
+            # far slower than a UI asks, so back-to-back calls share one read.
+            self.max_age = max_age
+            self._mag_cache = None
+            self._accel_cache = None
+            self._heading_cache = {}  # keyed by use_tilt_compensation
+
+            # Latest (magnetic, acceleration) from the poller; swapped as
+            # one tuple, so readers never see half an update
+            self._latest = None
+            self._stop_polling = threading.Event()
+            self._poller = None
+            if poll_hz:
+                self._poller = threading.Thread(
+                    target=self._poll_sensors, args=(1.0 / poll_hz,), daemon=True)
+                self._poller.start()
 
             print("✓ Compass initialized successfully")
 
@@ -96,13 +147,19 @@ class CompassManager:
         Returns:
             tuple: (x, y, z) magnetic field values in µT (microtesla)
         """
-        mag_x, mag_y, mag_z = self.mag.magnetic
+        now = time.monotonic()
+        if self._mag_cache is not None and now - self._mag_cache[0] < self.max_age:
+            return self._mag_cache[1]
+
+        latest = self._latest
+        mag_x, mag_y, mag_z = latest[0] if latest is not None else self.mag.magnetic
 
         # Apply calibration offsets
         mag_x -= self.cal_offset_x
         mag_y -= self.cal_offset_y
         mag_z -= self.cal_offset_z
 
+        self._mag_cache = (now, (mag_x, mag_y, mag_z))
         return (mag_x, mag_y, mag_z)
 
     def get_acceleration(self):
@@ -112,7 +169,30 @@ class CompassManager:
         Returns:
             tuple: (x, y, z) acceleration values in m/s²
         """
-        return self.accel.acceleration
+        now = time.monotonic()
+        if self._accel_cache is None or now - self._accel_cache[0] >= self.max_age:
+            latest = self._latest
+            accel = latest[1] if latest is not None else self.accel.acceleration
+            self._accel_cache = (now, accel)
+        return self._accel_cache[1]
+
+    def _poll_sensors(self, period):
+        """Background reader started by poll_hz; runs until cleanup()."""
+        next_read = time.monotonic()
+        while not self._stop_polling.wait(max(0.0, next_read - time.monotonic())):
+            try:
+                self._latest = (self.mag.magnetic, self.accel.acceleration)
+            except Exception as e:  # transient I2C error; try again next period
+                print(f"⚠ Compass read failed: {e}")
+            next_read += period
+
+    def cleanup(self):
+        """Stop the background sensor poller, if one was started."""
+        if self._poller is not None:
+            self._stop_polling.set()
+            self._poller.join()
+            self._poller = None
+            self._latest = None
 
     def get_heading(self, use_tilt_compensation=False):
         """
@@ -124,68 +204,91 @@ class CompassManager:
         Returns:
             float: Heading in degrees (0-360), where 0° is North
         """
-        mag_x, mag_y, mag_z = self.get_magnetic_field()
+        now = time.monotonic()
+        cached = self._heading_cache.get(use_tilt_compensation)
+        if cached is not None and now - cached[0] < self.max_age:
+            return cached[1]
+
+        # Get accelerometer data for tilt compensation
+        accel = self.get_acceleration() if use_tilt_compensation else None
+        return self._heading_from(now, self.get_magnetic_field(), accel)
+
+    def get_heading_fast(self):
+        """
+        Level-sensor heading from a fresh magnetometer reading, skipping the
+        reading cache, tilt compensation and stability tracking. For tight
+        loops that don't use is_heading_stable().
+
+        Returns:
+            float: Heading in degrees (0-360), where 0° is North
+        """
+        latest = self._latest
+        mag = latest[0] if latest is not None else self.mag.magnetic
+        heading = _degrees(_atan2(mag[1] - self.cal_offset_y, mag[0] - self.cal_offset_x))
+        return heading + 360 if heading < 0 else heading
+
+    def _heading_from(self, now, mag, accel=None):
+        """
+        Heading in degrees for a magnetometer reading already taken (tilt
+        compensated when an accelerometer reading is given), recorded in the
+        heading cache and the stability window.
+        """
+        mag_x, mag_y, mag_z = mag
+        use_tilt_compensation = accel is not None
 
         if use_tilt_compensation:
-            # Get accelerometer data for tilt compensation
-            accel_x, accel_y, accel_z = self.get_acceleration()
+            accel_x, accel_y, accel_z = accel
 
             # Calculate roll and pitch
-            roll = math.atan2(accel_y, accel_z)
-            pitch = math.atan2(-accel_x, math.sqrt(accel_y**2 + accel_z**2))
+            roll = _atan2(accel_y, accel_z)
+            pitch = _atan2(-accel_x, _sqrt(accel_y**2 + accel_z**2))
+            sin_roll, cos_roll = _sin(roll), _cos(roll)
+            sin_pitch, cos_pitch = _sin(pitch), _cos(pitch)
 
             # Tilt compensated magnetic field
-            mag_x_comp = mag_x * math.cos(pitch) + mag_z * math.sin(pitch)
-            mag_y_comp = (mag_x * math.sin(roll) * math.sin(pitch) +
-                         mag_y * math.cos(roll) -
-                         mag_z * math.sin(roll) * math.cos(pitch))
+            mag_x_comp = mag_x * cos_pitch + mag_z * sin_pitch
+            mag_y_comp = (mag_x * sin_roll * sin_pitch +
+                         mag_y * cos_roll -
+                         mag_z * sin_roll * cos_pitch)
 
-            heading = math.atan2(mag_y_comp, mag_x_comp)
+            heading = _atan2(mag_y_comp, mag_x_comp)
         else:
             # Simple heading calculation (sensor must be level)
-            heading = math.atan2(mag_y, mag_x)
+            heading = _atan2(mag_y, mag_x)
 
         # Convert to degrees
-        heading_degrees = math.degrees(heading)
+        heading_degrees = _degrees(heading)
 
         # Normalize to 0-360
         if heading_degrees < 0:
             heading_degrees += 360
 
-        # Track for stability detection
+        self._heading_cache[use_tilt_compensation] = (now, heading_degrees)
+
+        # Track for stability detection (fresh readings only)
         self.previous_readings.append(heading_degrees)
-        if len(self.previous_readings) > self.stability_window:
-            self.previous_readings.pop(0)
 
         return heading_degrees
 
-    def get_cardinal_direction(self, use_16_directions=False):
+    def get_cardinal_direction(self, use_16_directions=False, heading=None):
         """
         Get cardinal direction from current heading.
 
         Args:
             use_16_directions (bool): Use 16-point compass if True, 8-point if False
+            heading (float): Heading to convert; read from the sensor if omitted
 
         Returns:
             str: Cardinal direction (e.g., "N", "NE", "E", "SE", etc.)
         """
-        heading = self.get_heading()
+        if heading is None:
+            heading = self.get_heading()
 
         if use_16_directions:
             # 16-point compass rose
-            directions = [
-                "N", "NNE", "NE", "ENE",
-                "E", "ESE", "SE", "SSE",
-                "S", "SSW", "SW", "WSW",
-                "W", "WNW", "NW", "NNW"
-            ]
-            index = int((heading + 11.25) / 22.5) % 16
-        else:
-            # 8-point compass rose
-            directions = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
-            index = int((heading + 22.5) / 45) % 8
-
-        return directions[index]
+            return _DIR16[int((heading + 11.25) / 22.5) % 16]
+        # 8-point compass rose
+        return _DIR8[int((heading + 22.5) / 45) % 8]
 
     def get_heading_difference(self, target_heading):
         """
@@ -223,10 +326,16 @@ class CompassManager:
         if len(self.previous_readings) < self.stability_window:
             return False
 
-        # Calculate standard deviation of recent readings
-        mean = sum(self.previous_readings) / len(self.previous_readings)
-        variance = sum((x - mean) ** 2 for x in self.previous_readings) / len(self.previous_readings)
-        std_dev = math.sqrt(variance)
+        # Circular standard deviation of recent readings, so a heading
+        # wobbling across North (359°, 1°, ...) counts as steady
+        n = len(self.previous_readings)
+        sum_cos = sum_sin = 0.0
+        for x in self.previous_readings:
+            a = math.radians(x)
+            sum_cos += _cos(a)
+            sum_sin += _sin(a)
+        r = math.hypot(sum_cos, sum_sin) / n
+        std_dev = _degrees(_sqrt(max(0.0, -2.0 * math.log(max(r, 1e-12)))))
 
         return std_dev < threshold
 
@@ -237,13 +346,21 @@ class CompassManager:
         Returns:
             dict: Dictionary containing all sensor readings
         """
-        mag_x, mag_y, mag_z = self.get_magnetic_field()
+        # One magnetometer and one accelerometer read; the heading is worked
+        # out from that same magnetometer reading rather than read again
+        now = time.monotonic()
+        mag = self.get_magnetic_field()
+        mag_x, mag_y, mag_z = mag
         accel_x, accel_y, accel_z = self.get_acceleration()
-        heading = self.get_heading()
+        cached = self._heading_cache.get(False)
+        if cached is not None and now - cached[0] < self.max_age:
+            heading = cached[1]
+        else:
+            heading = self._heading_from(now, mag)
 
         return {
             'heading': heading,
-            'direction': self.get_cardinal_direction(),
+            'direction': self.get_cardinal_direction(heading=heading),
             'mag_x': mag_x,
             'mag_y': mag_y,
             'mag_z': mag_z,
@@ -278,36 +395,42 @@ class CompassManager:
         print("\nCalibrating... (30 seconds)")
         print("Keep rotating the sensor!")
 
-        # Collect min/max values
-        min_x = min_y = min_z = float('inf')
-        max_x = max_y = max_z = float('-inf')
-
-        start_time = time.time()
-        sample_count = 0
+        # Collect raw samples; min/max are reduced once at the end
+        samples = []
+        add_sample = samples.append
 
-        while time.time() - start_time < 30:
-            mag_x, mag_y, mag_z = self.mag.magnetic
+        start_time = time.monotonic()
+        shown = -1
 
-            min_x = min(min_x, mag_x)
-            max_x = max(max_x, mag_x)
-            min_y = min(min_y, mag_y)
-            max_y = max(max_y, mag_y)
-            min_z = min(min_z, mag_z)
-            max_z = max(max_z, mag_z)
+        while True:
+            elapsed = time.monotonic() - start_time
+            if elapsed >= 30:
+                break
+            add_sample(self.mag.magnetic)
 
-            sample_count += 1
+            # Progress indicator, redrawn once per second
+            if int(elapsed) != shown:
+                shown = int(elapsed)
+                print(f"Time: {shown}/30 sec | Samples: {len(samples)}", end='\r')
 
-            # Progress indicator
-            elapsed = int(time.time() - start_time)
-            print(f"Time: {elapsed}/30 sec | Samples: {sample_count}", end='\r')
+        sample_count = len(samples)
+        if not sample_count:
+            print("\n✗ No magnetometer samples collected; offsets unchanged")
+            return
 
-            time.sleep(0.05)
+        readings = np.array(samples, dtype=np.float64)
+        min_x, min_y, min_z = readings.min(axis=0).tolist()
+        max_x, max_y, max_z = readings.max(axis=0).tolist()
 
         # Calculate offsets (hard iron correction)
         self.cal_offset_x = (max_x + min_x) / 2
         self.cal_offset_y = (max_y + min_y) / 2
         self.cal_offset_z = (max_z + min_z) / 2
 
+        # Cached readings used the old offsets
+        self._mag_cache = None
+        self._heading_cache.clear()
+
         print("\n\n" + "="*60)
         print("CALIBRATION COMPLETE!")
         print("="*60)
@@ -331,22 +454,19 @@ class CompassManager:
             str: ASCII art compass display
         """
         heading = self.get_heading()
-        direction = self.get_cardinal_direction()
+        direction = self.get_cardinal_direction(heading=heading)
+
+        top, bottom, label_line, bar = _compass_template(width)
 
         # Create compass arrow
         arrow_pos = int((heading / 360) * width)
-        compass_line = ['-'] * width
-        compass_line[arrow_pos] = '^'
-
-        # Direction labels
-        labels = "N    E    S    W    N"
-        label_line = labels.center(width)
+        compass_line = bar[:arrow_pos] + '^' + bar[arrow_pos + 1:]
 
         compass_str = f"""
-┌{'─' * width}┐
-│{''.join(compass_line)}│
+{top}
+│{compass_line}│
 │{label_line}│
-└{'─' * width}┘
+{bottom}
   Heading: {heading:6.1f}° ({direction})
 """
         return compass_str
@@ -386,27 +506,38 @@ if __name__ == "__main__":
         print("="*60)
         print("Keep sensor level for accurate readings\n")
 
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        next_draw = 0.0
         while True:
             if choice == "3":
                 # Detailed data view
                 data = compass.get_all_data()
-                print("\n" + "-"*60)
-                print(f"Heading:    {data['heading']:6.1f}° ({data['direction']})")
-                print(f"Magnetic:   X={data['mag_x']:7.2f} Y={data['mag_y']:7.2f} Z={data['mag_z']:7.2f} µT")
-                print(f"Accel:      X={data['accel_x']:7.2f} Y={data['accel_y']:7.2f} Z={data['accel_z']:7.2f} m/s²")
-                print(f"Stable:     {'Yes' if data['is_stable'] else 'No'}")
+                write("\n" + "-"*60 + "\n"
+                      f"Heading:    {data['heading']:6.1f}° ({data['direction']})\n"
+                      f"Magnetic:   X={data['mag_x']:7.2f} Y={data['mag_y']:7.2f} Z={data['mag_z']:7.2f} µT\n"
+                      f"Accel:      X={data['accel_x']:7.2f} Y={data['accel_y']:7.2f} Z={data['accel_z']:7.2f} m/s²\n"
+                      f"Stable:     {'Yes' if data['is_stable'] else 'No'}\n")
+                flush()
                 time.sleep(0.5)
             else:
-                # Visual compass display
+                # Visual compass display: sample every pass so the stability
+                # window stays full, but redraw at most 4 times a second (one
+                # write and one flush; ESC[2K clears the old line)
                 heading = compass.get_heading()
-                direction = compass.get_cardinal_direction()
-                mag_x, mag_y, mag_z = compass.get_magnetic_field()
-                stable = "✓" if compass.is_heading_stable() else "✗"
-
-                print(f"Heading: {heading:6.1f}° ({direction:3s}) | " +
-                      f"Mag: X={mag_x:6.1f} Y={mag_y:6.1f} Z={mag_z:6.1f} µT | " +
-                      f"Stable: {stable}", end='\r')
-                time.sleep(0.1)
+                now = time.monotonic()
+                if now >= next_draw:
+                    direction = compass.get_cardinal_direction(heading=heading)
+                    # the reading get_heading just took, not a new one
+                    mag_x, mag_y, mag_z = compass.get_magnetic_field()
+                    stable = "✓" if compass.is_heading_stable() else "✗"
+
+                    write(f"\x1b[2K\rHeading: {heading:6.1f}° ({direction:3s}) | "
+                          f"Mag: X={mag_x:6.1f} Y={mag_y:6.1f} Z={mag_z:6.1f} µT | "
+                          f"Stable: {stable}")
+                    flush()
+                    next_draw = now + 0.25
+                time.sleep(0.1)  # matches max_age, so each pass gets a fresh reading
 
     except KeyboardInterrupt:
         print("\n\n" + "="*60)
@@ -35,9 +35,26 @@ Author: [Your Team Name]
 Date: November 2025
 """
 
+import os
 import time
 from datetime import datetime
 
+# Bound once; every getter below starts from the current system time
+_now = datetime.now
+
+DATETIME_24H = "%Y-%m-%d %H:%M:%S"
+DATETIME_12H = "%Y-%m-%d %I:%M:%S %p"
+
+# get_formatted_display's first two lines, e.g. "Friday, 07/11/2025\n18:30:45"
+DISPLAY_FORMAT = "%A, %d/%m/%Y\n%H:%M:%S"
+# Live clock line minus the temperature, e.g. "Friday | 2025-11-07 18:30:45"
+LIVE_FORMAT = "%A | " + DATETIME_24H
+
+# CPU temperature in millidegrees Celsius
+THERMAL_PATH = '/sys/class/thermal/thermal_zone0/temp'
+# Seconds a temperature reading is reused; the SoC temperature drifts slowly
+TEMP_TTL = 2.0
+
 
 class RTCManager:
     """
@@ -54,6 +71,12 @@ class RTCManager:
 
         Uses system time which is synced with DS3231 via kernel driver.
         """
+        # Kept open so each get_temperature() is a single pread()
+        try:
+            self._temp_fd = os.open(THERMAL_PATH, os.O_RDONLY)
+        except OSError:
+            self._temp_fd = None
+        self._temp_cache = (float('-inf'), 0.0)  # (monotonic time, °C)
         print("✓ RTC Manager initialized (using system time synced with DS3231)")
 
     def get_datetime_string(self, format_24h=True):
@@ -66,12 +89,12 @@ class RTCManager:
         Returns:
             str: Formatted datetime string (e.g., "2025-11-07 18:30:45")
         """
-        now = datetime.now()
+        now = _now()
 
         if format_24h:
-            return now.strftime("%Y-%m-%d %H:%M:%S")
+            return now.strftime(DATETIME_24H)
         else:
-            return now.strftime("%Y-%m-%d %I:%M:%S %p")
+            return now.strftime(DATETIME_12H)
 
     def get_time_string(self, format_24h=True):
         """
@@ -83,7 +106,7 @@ class RTCManager:
         Returns:
             str: Formatted time string (e.g., "18:30:45" or "06:30:45 PM")
         """
-        now = datetime.now()
+        now = _now()
 
         if format_24h:
             return now.strftime("%H:%M:%S")
@@ -97,7 +120,7 @@ class RTCManager:
         Returns:
             str: Formatted date string (e.g., "2025-11-07")
         """
-        now = datetime.now()
+        now = _now()
         return now.strftime("%Y-%m-%d")
 
     def get_datetime_components(self):
@@ -107,7 +130,7 @@ class RTCManager:
         Returns:
             tuple: (year, month, day, hour, minute, second)
         """
-        now = datetime.now()
+        now = _now()
         return (now.year, now.month, now.day,
                 now.hour, now.minute, now.second)
 
@@ -126,20 +149,34 @@ class RTCManager:
 
         Note: This returns CPU temperature, not DS3231 sensor temperature.
         The DS3231 temperature is not accessible when using kernel driver.
+        A reading is reused for TEMP_TTL seconds.
 
         Returns:
             float: CPU temperature in Celsius
         """
-        try:
-            with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-                temp = float(f.read()) / 1000.0
+        if self._temp_fd is None:
+            return 0.0
+        now = time.monotonic()
+        stamp, temp = self._temp_cache
+        if now - stamp < TEMP_TTL:
             return temp
-        except:
+        try:
+            # sysfs regenerates the value on every read from offset 0
+            temp = int(os.pread(self._temp_fd, 16, 0)) / 1000.0
+        except (OSError, ValueError):
             return 0.0
+        self._temp_cache = (now, temp)
+        return temp
+
+    def __del__(self):
+        fd = getattr(self, '_temp_fd', None)
+        if fd is not None:
+            os.close(fd)
 
     def set_datetime(self, year, month, day, hour, minute, second):
         """
-        Set the system time manually (requires sudo).
+        Set the system time manually (requires root, or sudo rights for
+        `date`).
 
         Args:
             year (int): Year (e.g., 2025)
@@ -155,11 +192,21 @@ class RTCManager:
         Note: This sets system time. The DS3231 will be updated automatically
               by the kernel driver.
         """
-        import os
-        date_string = f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
-        result = os.system(f"sudo date -s '{date_string}' > /dev/null 2>&1")
+        try:
+            target = datetime(year, month, day, hour, minute, second)  # local time, as date -s
+        except ValueError as e:
+            print(f"⚠ Failed to set time: {e}")
+            return
 
-        if result == 0:
+        try:
+            # One syscall when we already run as root
+            time.clock_settime(time.CLOCK_REALTIME, target.timestamp())
+            ok = True
+        except (PermissionError, AttributeError):
+            date_string = target.strftime(DATETIME_24H)
+            ok = os.system(f"sudo date -s '{date_string}' > /dev/null 2>&1") == 0
+
+        if ok:
             print(f"✓ System time set to: {self.get_datetime_string()}")
         else:
             print("⚠ Failed to set time (may need sudo privileges)")
@@ -171,7 +218,7 @@ class RTCManager:
         Returns:
             str: Day name (e.g., "Monday", "Tuesday")
         """
-        now = datetime.now()
+        now = _now()
         return now.strftime("%A")
 
     def get_am_pm(self):
@@ -181,7 +228,7 @@ class RTCManager:
         Returns:
             str: 'AM' if time is before noon, otherwise 'PM'
         """
-        now = datetime.now()
+        now = _now()
         return "AM" if now.hour < 12 else "PM"
 
     def is_daytime(self, sunrise_hour=6, sunset_hour=18):
@@ -195,7 +242,7 @@ class RTCManager:
         Returns:
             bool: True if daytime, False if nighttime
         """
-        now = datetime.now()
+        now = _now()
         return sunrise_hour <= now.hour < sunset_hour
 
     def get_formatted_display(self):
@@ -205,13 +252,8 @@ class RTCManager:
         Returns:
             str: Multi-line formatted display string
         """
-        now = datetime.now()
-        day_name = self.get_day_of_week()
-        temp = self.get_temperature()
-
-        return (f"{day_name}, {now.day:02d}/{now.month:02d}/{now.year}\n"
-                f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}\n"
-                f"CPU Temperature: {temp:.1f}°C")
+        # One clock read and one strftime for every date/time field
+        return f"{_now().strftime(DISPLAY_FORMAT)}\nCPU Temperature: {self.get_temperature():.1f}°C"
 
 
 # Example usage and testing
@@ -274,12 +316,9 @@ if __name__ == "__main__":
             print("Live Clock (press Ctrl+C to stop):")
             print("-"*60)
             while True:
-                # Clear line and print time
-                time_str = rtc.get_datetime_string()
-                temp = rtc.get_temperature()
-                day = rtc.get_day_of_week()
-
-                print(f"{day} | {time_str} | Temp: {temp:.1f}°C", end='\r')
+                # Clear line and print time, all fields from one clock read
+                stamp = datetime.now().strftime(LIVE_FORMAT)
+                print(f"{stamp} | Temp: {rtc.get_temperature():.1f}°C", end='\r')
                 time.sleep(1)
         else:
             print("Invalid choice, exiting test.")
@@ -28,6 +28,7 @@ import glob
 import time
 import argparse
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
 ROOT = os.path.dirname(__file__)
 PI_DIR = ROOT
@@ -40,15 +41,15 @@ HARDWARE_MODULES = {
 
 
 def syntax_check(path):
+    """Return (ok, message) for one file; printing is left to the caller so
+    checks can run on worker threads without interleaving output."""
     try:
         with open(path, 'r', encoding='utf-8') as f:
             src = f.read()
         compile(src, path, 'exec')
-        print(f"OK  - Syntax OK: {os.path.basename(path)}")
-        return True
+        return True, f"OK  - Syntax OK: {os.path.basename(path)}"
     except Exception as e:
-        print(f"ERR - Syntax error in {os.path.basename(path)}: {e}")
-        return False
+        return False, f"ERR - Syntax error in {os.path.basename(path)}: {e}"
 
 
 def run_buzzer_test(pin=17):
@@ -127,12 +128,15 @@ def main():
 
     # Syntax check all files
     print('\nRunning syntax checks:')
+    # Skip helper test runner itself when checking if running it
+    py_files = [p for p in py_files if os.path.basename(p) != os.path.basename(__file__)]
+    # File reads overlap on the pool; map() keeps results in file order
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        checks = list(ex.map(syntax_check, py_files))
     syntax_results = {}
-    for p in py_files:
-        # Skip helper test runner itself when checking if running it
-        if os.path.basename(p) == os.path.basename(__file__):
-            continue
-        syntax_results[p] = syntax_check(p)
+    for p, (ok, msg) in zip(py_files, checks):
+        print(msg)
+        syntax_results[p] = ok
 
     if args.only == 'syntax':
         print('\nSyntax check complete.')
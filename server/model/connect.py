@@ -1,12 +1,43 @@
 import sqlite3
 import os
+import threading
+
+from server.model.schema import CREATE_TABLE_SQL
 
 # Define the database path relative to the project root
 # (assuming the main script runs from the root)
 DB_PATH = "database/tles.db"
 
+# One long-lived connection per thread (sqlite3 connections are thread-bound)
+_tls = threading.local()
+
+# Set once init_db() has run, so later connections skip the schema round trips
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def init_db(conn):
+    """Create the tles table (and migrate older layouts) on `conn`.
+
+    get_db_connection() calls this for the first connection of the process;
+    every later connection trusts the schema is in place.
+    """
+    global _schema_ready
+    with _schema_lock:
+        if _schema_ready:
+            return
+        cur = conn.cursor()
+        cur.execute(CREATE_TABLE_SQL)
+        # Databases created before the checksum flag existed: old rows count as valid
+        if "valid" not in {col[1] for col in cur.execute("PRAGMA table_info(tles)")}:
+            cur.execute("ALTER TABLE tles ADD COLUMN valid INTEGER NOT NULL DEFAULT 1")
+        conn.commit()
+        _schema_ready = True
+
+
 def get_db_connection():
-    """Establishes a connection to the SQLite database and ensures tables exist."""
+    """Establishes a connection to the SQLite database and ensures tables exist
+    (the schema check itself runs once per process, see init_db)."""
 
     # Ensure the database directory exists
     db_dir = os.path.dirname(DB_PATH)
@@ -15,20 +46,27 @@ def get_db_connection():
         os.makedirs(db_dir)
 
     conn = sqlite3.connect(DB_PATH)
-    
-    # Create the tles table if it doesn't exist
-    cur = conn.cursor()
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS tles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            line1 TEXT NOT NULL,
-            line2 TEXT NOT NULL,
-            source TEXT,
-            fetched_at TEXT,
-            UNIQUE(name, line1, line2)
-        )
-    ''')
-    conn.commit()
-    
-    return conn
\ No newline at end of file
+
+    # WAL lets readers proceed during a bulk upsert, and with synchronous=NORMAL
+    # a commit no longer waits on an fsync of the main database file.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+
+    if not _schema_ready:
+        init_db(conn)
+
+    return conn
+
+
+def get_thread_connection():
+    """Return this thread's shared connection, opening it on first use.
+
+    Callers must not close it; it is reused by every later call on the
+    same thread, so the connect, PRAGMAs and schema check run only once.
+    """
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = _tls.conn = get_db_connection()
+    return conn
@@ -1,27 +1,48 @@
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, Protocol, runtime_checkable
+from typing import List, Dict, Any, Iterator, Optional, Protocol, runtime_checkable
 import abc
+import hashlib
+import sqlite3
 
-from server.model.connect import get_db_connection
-from server.service.connection_manager import IConnectionManager, ConnectionManager
+from server.model.connect import get_thread_connection
+from server.service.connection_manager import IConnectionManager, ConnectionManager, NotModified
 
 
 CELESTRAK_URL = "https://celestrak.org/NORAD/elements/gp.php"
 UPSERT_SQL = '''
-INSERT INTO tles (name, line1, line2, source, fetched_at)
-VALUES (?, ?, ?, ?, ?)
+INSERT INTO tles (name, line1, line2, source, fetched_at, valid)
+VALUES (?, ?, ?, ?, ?, ?)
 ON CONFLICT(name, line1, line2) DO UPDATE SET
     source=excluded.source,
-    fetched_at=excluded.source;
+    fetched_at=excluded.fetched_at,
+    valid=excluded.valid;
 '''
 
 
+def _tle_checksum_ok(line: str) -> bool:
+    """Modulo-10 checksum in column 69: digits count their value, '-' counts 1."""
+    if len(line) < 69 or not line[68].isdigit():
+        return False
+    total = sum(int(c) if c.isdigit() else c == '-' for c in line[:68])
+    return total % 10 == int(line[68])
+
+
 # OOP interface for TLE repository
 class ITleRepository(abc.ABC):
     @abc.abstractmethod
     def fetch_all_tles(self) -> List[Dict[str, Any]]:
         pass
 
+    @abc.abstractmethod
+    def iter_all_tles(self) -> Iterator[Any]:
+        """Stream every TLE row without materialising the whole table.
+
+        Rows support item access by column name (row['line1']), the same
+        keys as the dicts returned by fetch_all_tles. Rows that failed the
+        TLE checksum at ingest are skipped.
+        """
+        pass
+
     @abc.abstractmethod
     def fetch_satellite_by_id(self, satellite_id: int) -> Optional[Dict[str, Any]]:
         """Fetch a specific satellite's TLE data by its ID.
@@ -37,10 +58,31 @@ class ITleRepository(abc.ABC):
 
     @abc.abstractmethod
     def upsert_tles(self, tles, source: str):
+        """Insert or refresh a whole group of (name, line1, line2) tuples.
+
+        Implementations must store the batch in a single transaction with
+        one prepared statement (executemany of INSERT ... ON CONFLICT ...
+        DO UPDATE), never a commit per row; callers pass the full parsed
+        group in one call.
+        """
         pass
 
     @abc.abstractmethod
     def fetch_tle_group(self, group: str, timeout=20) -> str:
+        """Download a CelesTrak group as TLE text.
+
+        Raises NotModified when the group is unchanged since the last
+        stored fetch, so callers can skip parsing and storing it.
+        """
+        pass
+
+    @abc.abstractmethod
+    def commit_tle_group(self, group: str):
+        """Mark the body last returned by fetch_tle_group as stored.
+
+        Call only after upsert_tles succeeded; until then a repeat of the
+        same body is not reported as NotModified.
+        """
         pass
 
     @abc.abstractmethod
@@ -53,11 +95,16 @@ class SqliteTleRepository(ITleRepository):
     def __init__(self, conn=None, connection_manager: Optional[IConnectionManager] = None):
         self._external_conn = conn
         self._conn_manager = connection_manager or ConnectionManager()
+        # group -> digest of the last body that was stored
+        self._body_digests: Dict[str, bytes] = {}
+        # group -> digest of the body fetched but not yet committed
+        self._pending_digests: Dict[str, bytes] = {}
 
     def _get_conn(self):
         if self._external_conn is not None:
             return self._external_conn, False
-        return get_db_connection(), True
+        # Per-thread connection, kept open across calls
+        return get_thread_connection(), False
 
     def fetch_satellite_by_id(self, satellite_id: int) -> Optional[Dict[str, Any]]:
         """Fetch a specific satellite's TLE data by its ID.
@@ -98,27 +145,20 @@ class SqliteTleRepository(ITleRepository):
                     pass
 
     def fetch_all_tles(self) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.iter_all_tles()]
+
+    def iter_all_tles(self) -> Iterator[sqlite3.Row]:
         conn, close_conn = self._get_conn()
         try:
             cur = conn.cursor()
+            # Set on the cursor so an injected connection keeps its own factory
+            cur.row_factory = sqlite3.Row
             cur.execute(
-                "SELECT id, name, line1, line2, source, fetched_at FROM tles"
+                "SELECT id, name, line1, line2, source, fetched_at FROM tles WHERE valid = 1"
             )
-            rows = cur.fetchall()
-            results: List[Dict[str, Any]] = []
-            for row in rows:
-                results.append({
-                    "id": row[0],
-                    "name": row[1],
-                    "line1": row[2],
-                    "line2": row[3],
-                    "source": row[4],
-                    "fetched_at": row[5],
-                })
-            return results
+            yield from cur
         except Exception as e:
-            print(f"Error in fetch_all_tles: {e}")
-            return []
+            print(f"Error in iter_all_tles: {e}")
         finally:
             if close_conn:
                 try:
@@ -131,13 +171,19 @@ class SqliteTleRepository(ITleRepository):
         now = datetime.now(timezone.utc).isoformat()
         try:
             cur = conn.cursor()
+            # Checksums are verified once here, so queries can skip corrupt rows in SQL
             data_to_insert = [
-                (name, l1, l2, source, now) for name, l1, l2 in tles
+                (name, l1, l2, source, now, int(_tle_checksum_ok(l1) and _tle_checksum_ok(l2)))
+                for name, l1, l2 in tles
             ]
+            # Take the write lock up front so the whole group lands in one transaction
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
             cur.executemany(UPSERT_SQL, data_to_insert)
             conn.commit()
-        except Exception as e:
-            print(f"Error in upsert_tles: {e}")
+        except Exception:
+            conn.rollback()
+            raise  # callers must not treat a failed write as stored
         finally:
             if close_conn:
                 try:
@@ -145,33 +191,42 @@ class SqliteTleRepository(ITleRepository):
                 except Exception:
                     pass
 
+    @staticmethod
+    def _group_params(group: str) -> Dict[str, str]:
+        return { 'GROUP': group, 'FORMAT': 'tle' }
+
     def fetch_tle_group(self, group: str, timeout=20) -> str:
-        params = { 'GROUP': group, 'FORMAT': 'tle' }
-        return self._conn_manager.fetch_url(CELESTRAK_URL, params=params, timeout=timeout)
+        params = self._group_params(group)
+        text = self._conn_manager.fetch_url(CELESTRAK_URL, params=params, timeout=timeout)
+        # CelesTrak republishes on a schedule, so a full 200 often repeats the
+        # previous body; treat that like a 304 instead of re-parsing/upserting
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if self._body_digests.get(group) == digest:
+            raise NotModified(group)
+        self._pending_digests[group] = digest
+        return text
+
+    def commit_tle_group(self, group: str):
+        digest = self._pending_digests.pop(group, None)
+        if digest is not None:
+            self._body_digests[group] = digest
+        # The ETag/Last-Modified of this body are only trusted from now on too
+        self._conn_manager.commit_fetch(CELESTRAK_URL, params=self._group_params(group))
 
     def parse_tles(self, text: str):
-        lines = [l.rstrip('\n') for l in text.splitlines() if l.strip() != '']
+        lines = [l for l in text.splitlines() if l.strip() != '']
         tles = []
+        # Single forward pass over (name, line1, line2) windows; on a mismatch
+        # slide by one line so a stray line can't desynchronise the rest.
         i = 0
-        while i < len(lines) - 1:
-            if lines[i].startswith('1 ') and i >= 1:
-                name = lines[i-1]
-                line1 = lines[i]
-                line2 = lines[i+1] if (i+1) < len(lines) else ''
+        n = len(lines)
+        while i + 2 < n:
+            name, line1, line2 = lines[i], lines[i+1], lines[i+2]
+            if line1.startswith('1 ') and line2.startswith('2 '):
                 tles.append((name, line1, line2))
-                i += 2
+                i += 3
             else:
-                if i + 2 < len(lines):
-                    name = lines[i]
-                    line1 = lines[i+1]
-                    line2 = lines[i+2]
-                    if line1.startswith('1 ') and line2.startswith('2 '):
-                        tles.append((name, line1, line2))
-                        i += 3
-                    else:
-                        i += 1
-                else:
-                    break
+                i += 1
         return tles
 
 
@@ -193,4 +248,6 @@ class TleRepositoryUtils:
         # print(f'  parsed {len(tles)} TLE entries from group {group}')
         # # 3. Store
         # repo.upsert_tles(tles, source=source_name)
+        # # 4. Only now skip identical bodies (upsert_tles raises on failure)
+        # repo.commit_tle_group(group)
         # print(f'  Successfully stored group {group} in the database.')
\ No newline at end of file
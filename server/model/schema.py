@@ -6,6 +6,7 @@ CREATE TABLE IF NOT EXISTS tles (
     line2 TEXT NOT NULL,
     source TEXT,
     fetched_at TEXT,
+    valid INTEGER NOT NULL DEFAULT 1,
     UNIQUE(name, line1, line2)
 );
 '''
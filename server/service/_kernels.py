@@ -0,0 +1,56 @@
+"""Compiled numeric kernels for the satellite service.
+
+Numba is an optional dependency. When it is installed the kernels below are
+compiled with `@njit`; otherwise `NUMBA_AVAILABLE` is False and callers keep
+using the NumPy implementation in `satellite_service`.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels stay importable without numba."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+# Everything fastmath allows except the no-NaN/no-inf assumptions, since the
+# reduction starts from +inf.
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def nearest(r, ok, obs_x, obs_y, obs_z, gst):
+    """Rotate (N, 3) TEME positions `r` to ECEF by `gst` and return
+    (index, distance_km) of the one closest to the observer. Rows with
+    `ok[i] == False` are skipped.
+
+    `r` may be a strided view (e.g. straight out of SatrecArray.sgp4): three
+    loads per row are cheaper than first copying it into per-axis arrays.
+
+    Returns (-1, inf) when no row is usable.
+    """
+    cos_t = math.cos(gst)
+    sin_t = math.sin(gst)
+    best = -1
+    best_d2 = np.inf
+    for i in range(r.shape[0]):
+        if not ok[i]:
+            continue
+        x = r[i, 0]
+        y = r[i, 1]
+        dx = cos_t * x + sin_t * y - obs_x
+        dy = -sin_t * x + cos_t * y - obs_y
+        dz = r[i, 2] - obs_z
+        d2 = dx * dx + dy * dy + dz * dz
+        if d2 < best_d2:
+            best_d2 = d2
+            best = i
+    return best, math.sqrt(best_d2)
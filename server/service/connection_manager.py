@@ -1,10 +1,17 @@
 """Network connectivity interface and implementations for satellite data services."""
 import abc
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import time
 
 
+class NotModified(Exception):
+    """Raised by fetch_url when the server answers a conditional GET with
+    304: the resource is unchanged since the last committed fetch."""
+
+
 class IConnectionManager(abc.ABC):
     @abc.abstractmethod
     def is_available(self) -> bool:
@@ -18,7 +25,17 @@ class IConnectionManager(abc.ABC):
 
     @abc.abstractmethod
     def fetch_url(self, url: str, params: Optional[Dict] = None, timeout: int = 20) -> str:
-        """Fetch data from URL using best available connection method."""
+        """Fetch data from URL using best available connection method.
+
+        Raises NotModified if the resource hasn't changed since it was last
+        committed through this manager.
+        """
+        pass
+
+    @abc.abstractmethod
+    def commit_fetch(self, url: str, params: Optional[Dict] = None):
+        """Keep the validators of the last fetch_url(url, params) for the
+        next conditional GET; call once its body has been stored."""
         pass
 
 
@@ -38,12 +55,36 @@ class ConnectionStrategy(abc.ABC):
         """Try to fetch URL using this connection method. Returns None if fails."""
         pass
 
+    def commit_fetch(self, url: str, params: Optional[Dict] = None):
+        """Strategies without conditional GETs have nothing to keep."""
+        pass
+
 
 class WifiStrategy(ConnectionStrategy):
     def __init__(self, test_url: str = "https://celestrak.org"):
         self.test_url = test_url
         self._last_check_time = 0
         self._check_interval = 5  # seconds between availability checks
+        # Kept-alive HTTPS connections shared by the probe and every fetch, so
+        # only the first request to a host pays the TCP + TLS handshake
+        self._session = requests.Session()
+        # Transient DNS/TLS flaps and 5xx answers are retried inside the call
+        # (0.5 s, 1 s, 2 s apart) rather than costing a whole scheduler retry
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                        allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        self._session.mount("https://", adapter)
+        # The availability probe must answer within its own timeout, so it goes
+        # through a no-retry adapter that still shares the same connection pool
+        probe_adapter = HTTPAdapter(max_retries=0)
+        probe_adapter.poolmanager = adapter.poolmanager
+        self._probe_session = requests.Session()
+        self._probe_session.mount("https://", probe_adapter)
+        # (url, params) -> (ETag, Last-Modified) of the last stored 200, for
+        # conditional GETs; a 200 waits in _pending_validators until
+        # commit_fetch, so a body that failed to store is downloaded again
+        self._validators: Dict[Tuple, Tuple[Optional[str], Optional[str]]] = {}
+        self._pending_validators: Dict[Tuple, Tuple[Optional[str], Optional[str]]] = {}
 
     def is_available(self) -> bool:
         now = time.time()
@@ -51,7 +92,8 @@ class WifiStrategy(ConnectionStrategy):
             return self._last_status
 
         try:
-            requests.get(self.test_url, timeout=5)
+            # Any response proves connectivity; HEAD skips downloading the page
+            self._probe_session.head(self.test_url, timeout=5, allow_redirects=False)
             self._last_status = True
         except Exception:
             self._last_status = False
@@ -66,16 +108,49 @@ class WifiStrategy(ConnectionStrategy):
             "last_check": self._last_check_time
         }
 
+    @staticmethod
+    def _key(url: str, params: Optional[Dict]) -> Tuple:
+        return (url, tuple(sorted((params or {}).items())))
+
+    def commit_fetch(self, url: str, params: Optional[Dict] = None):
+        key = self._key(url, params)
+        validators = self._pending_validators.pop(key, None)
+        if validators is not None:
+            self._validators[key] = validators
+
     def fetch_url(self, url: str, params: Optional[Dict] = None, timeout: int = 20) -> Optional[str]:
-        if not self.is_available():
+        key = self._key(url, params)
+        etag, last_modified = self._validators.get(key, (None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        # No separate probe: the fetch itself tells us whether the link is up,
+        # and its outcome refreshes the cached availability.
+        try:
+            resp = self._session.get(url, params=params, timeout=timeout, headers=headers)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self._last_status = False
+            self._last_check_time = time.time()
             return None
-
+        except Exception:
+            return None
+        self._last_status = True
+        self._last_check_time = time.time()
+        if resp.status_code == 304:
+            raise NotModified(url)
         try:
-            resp = requests.get(url, params=params, timeout=timeout)
             resp.raise_for_status()
-            return resp.text
         except Exception:
             return None
+        validators = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        if any(validators):
+            self._pending_validators[key] = validators
+        # One decode of the raw body; Response.text would first run charset
+        # detection over all of it when the server names no encoding
+        return resp.content.decode(resp.encoding or "utf-8", errors="replace")
 
 
 # Add more strategies here, e.g.:
@@ -102,9 +177,6 @@ class ConnectionManager(IConnectionManager):
         errors = []
 
         for strategy in self.strategies:
-            if not strategy.is_available():
-                continue
-
             result = strategy.fetch_url(url, params, timeout)
             if result is not None:
                 return result
@@ -113,4 +185,9 @@ class ConnectionManager(IConnectionManager):
 
         raise ConnectionError(
             f"All connection strategies failed: {', '.join(errors)}"
-        )
\ No newline at end of file
+        )
+
+    def commit_fetch(self, url: str, params: Optional[Dict] = None):
+        # Only the strategy that served the fetch has anything pending
+        for strategy in self.strategies:
+            strategy.commit_fetch(url, params)
\ No newline at end of file
@@ -1,10 +1,15 @@
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+import functools
 import math
+import threading
 
-from sgp4.api import Satrec, jday
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, jday
 
 from server.model.repository import ITleRepository, SqliteTleRepository
+from server.service import _kernels
 
 # OOP interface for satellite service
 import abc
@@ -19,81 +24,315 @@ class ISatelliteService(abc.ABC):
         pass
 
 
+@dataclass(frozen=True)
+class SatelliteStates:
+    """Column-oriented snapshot of every parseable TLE propagated to `when`.
+
+    Row k of each array describes the same satellite; `tle_index[k]` points
+    back into the repository rows the snapshot was built from.
+    """
+    when: datetime
+    tle_index: np.ndarray  # (N,) intp
+    ids: np.ndarray        # (N,) object
+    names: np.ndarray      # (N,) object
+    error: np.ndarray      # (N,) int, sgp4 error code
+    pos_eci: np.ndarray    # (N, 3) km
+    vel: np.ndarray        # (N, 3) km/s
+
+    def __len__(self) -> int:
+        return len(self.tle_index)
+
+    @functools.cached_property
+    def ok(self) -> np.ndarray:
+        """Rows that propagated without error to a finite position."""
+        return (self.error == 0) & np.isfinite(self.pos_eci).all(axis=1)
+
+    @functools.cached_property
+    def pos_ecef(self) -> np.ndarray:
+        """(N, 3) ECEF positions in km, rotated on first access."""
+        return _eci_to_ecef_array(self.pos_eci, self.when)
+
+
+# (t0 epoch s, dt s, ECEF float32 (N, T, 3), ok (N, T)) from precompute_grid()
+_Grid = Tuple[float, float, np.ndarray, np.ndarray]
+
+
+@dataclass(frozen=True, eq=False)
+class _Catalog:
+    """Parsed TLEs published as one unit, so a query never mixes the rows of
+    one refresh with the satrecs or grid of another.
+
+    Hashed by identity: the per-service caches key on the snapshot, so a
+    result computed against an old catalog can't be served for a new one.
+    """
+    key: tuple
+    tles: Sequence[Any]
+    valid_idx: np.ndarray          # (N,) intp, rows of `tles` that parsed
+    sat_array: Optional[SatrecArray]
+    satrecs: List[Satrec]
+    grid: Optional[_Grid] = None
+
+
+_EMPTY_CATALOG = _Catalog((), (), np.empty(0, dtype=np.intp), None, [])
+
+
 class Sgp4SatelliteService(ISatelliteService):
     def __init__(self, tle_repository: ITleRepository):
         self.tle_repository = tle_repository
+        # Parsed TLEs are reused across calls until the repository rows change.
+        # The scheduler thread publishes a new snapshot by one assignment under
+        # the lock; queries read self._catalog once and use only that object.
+        self._lock = threading.Lock()
+        self._catalog = _EMPTY_CATALOG
+        # Winning row per (catalog, 1 s, ~100 m) bin; cleared whenever a new catalog is published.
+        self._nearest_cached = functools.lru_cache(maxsize=4096)(self._nearest_in_bin)
+        # Whole-catalog snapshot per UTC second, shared by every bin in that second.
+        self._states_cached = functools.lru_cache(maxsize=4)(self._states_at_second)
+
+    def _publish(self, catalog: _Catalog) -> None:
+        # Callers hold self._lock. Entries keyed by the old snapshot can no
+        # longer match; clearing just frees them.
+        self._catalog = catalog
+        self._nearest_cached.cache_clear()
+        self._states_cached.cache_clear()
+
+    def _load_catalog(self, tles: Sequence[Any]) -> _Catalog:
+        """Return the catalog snapshot for the given rows.
+
+        The SatrecArray is rebuilt only when the set of TLE lines changes, so
+        repeated queries skip `Satrec.twoline2rv` entirely. The snapshot's key
+        always matches `tles`, so callers may index their own (fresher
+        source/fetched_at) rows with its valid_idx.
+        """
+        key = tuple((tle["id"], tle["line1"], tle["line2"]) for tle in tles)
+        catalog = self._catalog
+        if key == catalog.key:
+            return catalog
+        valid_idx = []
+        satrecs = []
+        for i, tle in enumerate(tles):
+            satrec = _satrec_from_tle(tle["line1"], tle["line2"])
+            if satrec is not None:
+                valid_idx.append(i)
+                satrecs.append(satrec)
+        sat_array = SatrecArray(satrecs) if satrecs else None
+        catalog = _Catalog(key, tles, np.array(valid_idx, dtype=np.intp), sat_array, satrecs)
+        with self._lock:
+            # Another thread may have published these same rows meanwhile
+            if self._catalog.key != key:
+                self._publish(catalog)
+            return self._catalog
+
+    def precompute_grid(self, t0: Optional[datetime] = None, dt: float = 10.0, horizon: float = 3600.0) -> None:
+        """Propagate the catalog once over [t0, t0 + horizon] in `dt` steps.
+
+        Nearest-satellite searches that fall inside the window then
+        interpolate between grid points instead of running SGP4 for every
+        satellite. The grid is dropped when the catalog changes.
+        """
+        t0 = _as_utc(t0)
+        catalog = self._load_catalog(self.tle_repository.fetch_all_tles())
+        if catalog.sat_array is None:
+            return
+        n_t = int(horizon // dt) + 1
+        jd0, fr0 = _jday_utc(t0)
+        jd = np.full(n_t, jd0)
+        fr = fr0 + np.arange(n_t) * (dt / 86_400.0)
+        error, eci, _ = catalog.sat_array.sgp4(jd, fr)  # (N, T), (N, T, 3)
+
+        # One Z rotation per time step
+        theta = _gmst_rad_from_jd(jd + fr)
+        cos_t, sin_t = np.cos(theta), np.sin(theta)
+        ecef = np.empty(eci.shape, dtype=np.float32)
+        ecef[..., 0] = cos_t * eci[..., 0] + sin_t * eci[..., 1]
+        ecef[..., 1] = -sin_t * eci[..., 0] + cos_t * eci[..., 1]
+        ecef[..., 2] = eci[..., 2]
+        ok = (error == 0) & np.isfinite(ecef).all(axis=2)
+        with self._lock:
+            # A grid for rows that were replaced while it was computed is useless
+            if self._catalog is catalog:
+                self._publish(replace(catalog, grid=(t0.timestamp(), dt, ecef, ok)))
+
+    @staticmethod
+    def _nearest_from_grid(grid: Optional[_Grid], t_s: float, user_ecef: List[float]) -> Optional[int]:
+        """Catalog row nearest to `user_ecef` by interpolating the grid, or
+        None when there is no grid covering `t_s` (or nothing usable in it)."""
+        if grid is None:
+            return None
+        t0, dt, ecef, ok = grid
+        k = (t_s - t0) / dt
+        i = math.floor(k)
+        if i < 0 or i + 1 >= ecef.shape[1]:
+            return None
+        alpha = k - i
+        pos = (1.0 - alpha) * ecef[:, i] + alpha * ecef[:, i + 1]
+        diff = pos - np.asarray(user_ecef, dtype=np.float32)
+        dist2 = np.einsum("ij,ij->i", diff, diff)
+        dist2[~(ok[:, i] & ok[:, i + 1])] = np.inf
+        best = int(np.argmin(dist2))
+        return best if math.isfinite(dist2[best]) else None
+
+    def propagate_states(self, when: Optional[datetime] = None, tles: Optional[List[Dict[str, Any]]] = None) -> SatelliteStates:
+        """Propagate every parseable TLE to `when` and return the columns."""
+        if tles is None:
+            tles = self.tle_repository.fetch_all_tles()
+        return self._propagate_catalog(self._load_catalog(tles), _as_utc(when), tles)
+
+    @staticmethod
+    def _propagate_catalog(catalog: _Catalog, when: datetime, tles: Optional[Sequence[Any]] = None) -> SatelliteStates:
+        """`propagate_states` for one snapshot; `tles` defaults to its own rows."""
+        if tles is None:
+            tles = catalog.tles
+        valid_idx, sat_array = catalog.valid_idx, catalog.sat_array
+        if sat_array is None:
+            empty = np.empty((0, 3))
+            return SatelliteStates(when, valid_idx, np.empty(0, dtype=object), np.empty(0, dtype=object),
+                                   np.empty(0, dtype=int), empty, empty)
+
+        error, eci, velocity = _propagate_array(sat_array, when)
+        ids = np.empty(len(valid_idx), dtype=object)
+        names = np.empty(len(valid_idx), dtype=object)
+        ids[:] = [tles[i]["id"] for i in valid_idx.tolist()]
+        names[:] = [tles[i]["name"] for i in valid_idx.tolist()]
+        return SatelliteStates(when, valid_idx, ids, names, error, eci, velocity)
 
     def find_nearest_satellite(self, lat_deg: float, lon_deg: float, alt_m: float, when: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
-        if when is None:
-            when = datetime.now(timezone.utc)
+        when = _as_utc(when)
+        # sqlite3.Row objects, read in place rather than copied into dicts
+        tles = list(self.tle_repository.iter_all_tles())
+        catalog = self._load_catalog(tles)
+
+        # The winner changes slowly, so nearby callers at about the same time
+        # share one full search; only the winner is propagated to the exact inputs.
+        best = self._nearest_cached(
+            catalog,
+            round(when.timestamp()),
+            round(lat_deg * 1000),
+            round(lon_deg * 1000),
+            round(alt_m),
+        )
+        if best is None:
+            return None
+        # One calendar conversion serves both the propagation and the rotation
+        jd, fr = _jday_utc(when)
+        state = _compute_state_for_jdfr(catalog.satrecs[best], jd, fr)
+        eci = state["position_km"]
+        if state["error"] != 0 or not all(map(math.isfinite, eci)):
+            # Winner at the bin centre decayed by `when`; search this instant directly
+            states = self._propagate_catalog(catalog, when, tles)
+            best, dist, ecef = self._nearest_row(states, lat_deg, lon_deg, alt_m)
+            if best is None:
+                return None
+            return _nearest_result(tles[states.tle_index[best]], when, dist, ecef,
+                                   states.pos_eci[best].tolist(), states.vel[best].tolist())
+
+        ecef = (_frame_from_jdfr(jd, fr)[1] @ np.asarray(eci)).tolist()
+        dist = math.dist(ecef, _geodetic_to_ecef(lat_deg, lon_deg, alt_m))
+        return _nearest_result(tles[catalog.valid_idx[best]], when, dist, ecef, eci, state["velocity_km_s"])
+
+    def _nearest_in_bin(self, catalog: _Catalog, t_s: int, lat_mdeg: int, lon_mdeg: int, alt_m: int) -> Optional[int]:
+        """Row of `catalog` nearest to the centre of a cache bin."""
+        best = self._nearest_from_grid(catalog.grid, t_s, _geodetic_to_ecef(lat_mdeg / 1000, lon_mdeg / 1000, alt_m))
+        if best is not None:
+            return best
+        return self._nearest_row(self._states_cached(catalog, t_s), lat_mdeg / 1000, lon_mdeg / 1000, alt_m)[0]
+
+    def _states_at_second(self, catalog: _Catalog, t_s: int) -> SatelliteStates:
+        """`catalog` propagated to the whole UTC second `t_s`."""
+        return self._propagate_catalog(catalog, datetime.fromtimestamp(t_s, timezone.utc))
+
+    @staticmethod
+    def _nearest_row(states: SatelliteStates, lat_deg: float, lon_deg: float, alt_m: float) -> Tuple[Optional[int], float, List[float]]:
+        """Return (row, distance_km, ecef_km) of the closest usable satellite."""
+        when = states.when
+        ok = states.ok
+        if not ok.any():
+            return None, math.inf, []
+
+        eci = states.pos_eci
         user_ecef = _geodetic_to_ecef(lat_deg, lon_deg, alt_m)
-        tles = self.tle_repository.fetch_all_tles()
-        best = None
-        best_dist = float("inf")
-        for tle in tles:
-            satrec = _satrec_from_tle(tle["line1"], tle["line2"])
-            if satrec is None:
-                continue
-            state = _compute_state_for_datetime(satrec, when)
-            if state.get("error", 0) != 0:
-                continue
-            eci_pos = state.get("position_km")
-            if not eci_pos:
-                continue
-            ecef_pos = _eci_to_ecef(eci_pos, when)
-            dx = ecef_pos[0] - user_ecef[0]
-            dy = ecef_pos[1] - user_ecef[1]
-            dz = ecef_pos[2] - user_ecef[2]
-            dist = math.sqrt(dx * dx + dy * dy + dz * dz)
-            if dist < best_dist:
-                best_dist = dist
-                best = {
-                    "id": tle["id"],
-                    "name": tle["name"],
-                    "source": tle.get("source"),
-                    "fetched_at": tle.get("fetched_at"),
-                    "when_utc": when.isoformat(),
-                    "distance_km": dist,
-                    "position_ecef_km": ecef_pos,
-                    "position_eci_km": eci_pos,
-                    "velocity_km_s": state.get("velocity_km_s"),
-                }
-        return best
+        if _kernels.NUMBA_AVAILABLE:
+            # Single compiled pass: rotation, distance and argmin together.
+            best, dist = _kernels.nearest(
+                eci,
+                ok,
+                user_ecef[0], user_ecef[1], user_ecef[2],
+                compute_frame(when)[0],
+            )
+            ecef_best = _eci_to_ecef(eci[best].tolist(), when)
+        else:
+            # Rank in float32 (sub-metre at orbital radii, half the bandwidth);
+            # only the winner's distance is recomputed in float64.
+            diff = states.pos_ecef.astype(np.float32) - np.asarray(user_ecef, dtype=np.float32)
+            dist2 = np.einsum("ij,ij->i", diff, diff)
+            dist2[~ok] = np.inf
+            best = int(np.argmin(dist2))
+            ecef_best = states.pos_ecef[best].tolist()
+            dist = math.dist(ecef_best, user_ecef)
+        return int(best), dist, ecef_best
 
     def get_all_satellite_states(self, when: Optional[datetime] = None) -> List[Dict[str, Any]]:
         tles = self.tle_repository.fetch_all_tles()
-        if when is None:
-            when = datetime.now(timezone.utc)
+        snapshot = self.propagate_states(when, tles)
+        when = snapshot.when
+
+        # Box the whole batch in one go rather than row by row
+        states: Dict[int, Tuple[int, List[float], List[float]]] = dict(zip(
+            snapshot.tle_index.tolist(),
+            zip(snapshot.error.tolist(), snapshot.pos_eci.tolist(), snapshot.vel.tolist()),
+        ))
+
+        when_iso = when.isoformat()
         results: List[Dict[str, Any]] = []
-        for tle in tles:
-            satrec = _satrec_from_tle(tle["line1"], tle["line2"])
-            if satrec is None:
+        for i, tle in enumerate(tles):
+            state = states.get(i)
+            if state is None:
                 results.append({
                     "id": tle["id"],
                     "name": tle["name"],
                     "error": "invalid_tle",
                 })
                 continue
-            state = _compute_state_for_datetime(satrec, when)
             results.append({
                 "id": tle["id"],
                 "name": tle["name"],
                 "source": tle.get("source"),
                 "fetched_at": tle.get("fetched_at"),
-                "when_utc": when.isoformat(),
-                "sgp4_error": state["error"],
-                "position_km": state.get("position_km"),
-                "velocity_km_s": state.get("velocity_km_s"),
+                "when_utc": when_iso,
+                "sgp4_error": state[0],
+                "position_km": state[1],
+                "velocity_km_s": state[2],
             })
         return results
 
 
-def _jd_from_datetime(when: datetime):
-    """Return Julian date as a single float (JD) from a UTC datetime.
+def _nearest_result(tle, when: datetime, dist: float, ecef: List[float],
+                    eci: List[float], velocity: List[float]) -> Dict[str, Any]:
+    return {
+        "id": tle["id"],
+        "name": tle["name"],
+        "source": tle["source"],
+        "fetched_at": tle["fetched_at"],
+        "when_utc": when.isoformat(),
+        "distance_km": float(dist),
+        "position_ecef_km": ecef,
+        "position_eci_km": eci,
+        "velocity_km_s": velocity,
+    }
 
-    Uses sgp4.api.jday to get jd and fr and returns jd + fr.
-    """
-    jd, fr = jday(
+
+def _as_utc(when: Optional[datetime]) -> datetime:
+    """Return `when` as an aware UTC datetime (now if None, naive treated as UTC)."""
+    if when is None:
+        return datetime.now(timezone.utc)
+    if when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+
+def _jday_utc(when: datetime) -> Tuple[float, float]:
+    """(jd, fr) pair for a UTC datetime, as taken by Satrec.sgp4."""
+    return jday(
         when.year,
         when.month,
         when.day,
@@ -101,6 +340,14 @@ def _jd_from_datetime(when: datetime):
         when.minute,
         when.second + when.microsecond / 1_000_000.0,
     )
+
+
+def _jd_from_datetime(when: datetime):
+    """Return Julian date as a single float (JD) from a UTC datetime.
+
+    Uses sgp4.api.jday to get jd and fr and returns jd + fr.
+    """
+    jd, fr = _jday_utc(when)
     return jd + fr
 
 
@@ -118,38 +365,70 @@ def _gmst_rad_from_jd(jd: float) -> float:
         + 0.000387933 * T * T
         - (T ** 3) / 38710000.0
     )
-    # Normalize
+    # Normalize (written without math.* so `jd` may also be a NumPy array)
     gmst_deg = gmst_deg % 360.0
-    return math.radians(gmst_deg)
+    return gmst_deg * (math.pi / 180.0)
 
 
-def _eci_to_ecef(position_km: List[float], when: datetime) -> List[float]:
-    """Approximate conversion from ECI (assumed TEME/ECI) to ECEF by rotating
-    around the Z axis by GMST. Returns position in km in ECEF frame.
+def compute_frame(when: datetime) -> Tuple[float, np.ndarray]:
+    """Return (gmst_rad, R_teme_to_ecef) for a UTC datetime.
+
+    Results are cached per millisecond instant, so every satellite propagated
+    to the same `when` (and repeated queries at that instant) share one
+    GMST evaluation. The returned matrix is read-only.
     """
-    jd = _jd_from_datetime(when)
-    theta = _gmst_rad_from_jd(jd)
+    return _frame_from_jdfr(*_jday_utc(_as_utc(when)))
+
+
+def _frame_from_jdfr(jd: float, fr: float) -> Tuple[float, np.ndarray]:
+    """`compute_frame` for a caller that already has (jd, fr)."""
+    return _frame_params(jd, round(fr * 86_400_000))
+
+
+@functools.lru_cache(maxsize=256)
+def _frame_params(jd: float, fr_ms: int) -> Tuple[float, np.ndarray]:
+    theta = _gmst_rad_from_jd(jd + fr_ms / 86_400_000)
     cos_t = math.cos(theta)
     sin_t = math.sin(theta)
-    x = position_km[0]
-    y = position_km[1]
-    z = position_km[2]
     # Rotation about Z: ECEF = Rz(gmst) * ECI
-    xe = cos_t * x + sin_t * y
-    ye = -sin_t * x + cos_t * y
-    ze = z
-    return [xe, ye, ze]
+    rotation = np.array([
+        [cos_t, sin_t, 0.0],
+        [-sin_t, cos_t, 0.0],
+        [0.0, 0.0, 1.0],
+    ])
+    rotation.setflags(write=False)
+    return theta, rotation
+
+
+def _eci_to_ecef(position_km: List[float], when: datetime) -> List[float]:
+    """Approximate conversion from ECI (assumed TEME/ECI) to ECEF by rotating
+    around the Z axis by GMST. Returns position in km in ECEF frame.
+    """
+    _, rotation = compute_frame(when)
+    return (rotation @ np.asarray(position_km, dtype=float)).tolist()
+
+
+def _eci_to_ecef_array(position_km: np.ndarray, when: datetime) -> np.ndarray:
+    """Vectorized `_eci_to_ecef` for an (N, 3) array of positions."""
+    _, rotation = compute_frame(when)
+    return np.einsum("ij,nj->ni", rotation, position_km)
+
 
+# WGS84 ellipsoid
+_WGS84_A = 6378.137  # km
+_WGS84_F = 1.0 / 298.257223563
+_WGS84_E2 = _WGS84_F * (2 - _WGS84_F)
 
-def _geodetic_to_ecef(lat_deg: float, lon_deg: float, alt_m: float) -> List[float]:
+
+@functools.lru_cache(maxsize=128)
+def _geodetic_to_ecef(lat_deg: float, lon_deg: float, alt_m: float) -> Tuple[float, float, float]:
     """Convert geodetic coordinates (deg, deg, meters) to ECEF (km).
 
-    Uses WGS84 ellipsoid.
+    Uses WGS84 ellipsoid. Observers rarely move between queries, so results
+    are cached per position (hence the immutable tuple).
     """
-    # WGS84 constants
-    a = 6378.137  # km
-    f = 1.0 / 298.257223563
-    e2 = f * (2 - f)
+    a = _WGS84_A
+    e2 = _WGS84_E2
 
     lat = math.radians(lat_deg)
     lon = math.radians(lon_deg)
@@ -163,13 +442,16 @@ def _geodetic_to_ecef(lat_deg: float, lon_deg: float, alt_m: float) -> List[floa
     x = (N + alt_km) * cos_lat * math.cos(lon)
     y = (N + alt_km) * cos_lat * math.sin(lon)
     z = (N * (1 - e2) + alt_km) * sin_lat
-    return [x, y, z]
+    return (x, y, z)
 
 # Data querying is intentionally kept in the model/repository layer. The
 # service calls `fetch_all_tles()` (which may open its own DB connection).
 
 
+@functools.lru_cache(maxsize=20000)
 def _satrec_from_tle(line1: str, line2: str) -> Optional[Satrec]:
+    # Keyed by the raw lines, so a catalog rebuild after a refresh only
+    # parses TLEs that actually changed; unparseable lines cache as None.
     try:
         satrec = Satrec.twoline2rv(line1, line2)
         return satrec
@@ -177,6 +459,16 @@ def _satrec_from_tle(line1: str, line2: str) -> Optional[Satrec]:
         return None
 
 
+def _propagate_array(sat_array: SatrecArray, when: datetime) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Propagate every satellite in `sat_array` to a single UTC datetime.
+
+    Returns (error codes (N,), positions_km (N, 3), velocities_km_s (N, 3)).
+    """
+    jd, fr = _jday_utc(when)
+    e, r, v = sat_array.sgp4(np.array([jd]), np.array([fr]))
+    return e[:, 0], r[:, 0, :], v[:, 0, :]
+
+
 def _compute_state_for_datetime(satrec: Satrec, when: datetime) -> Dict[str, Any]:
     """Compute satellite state (position/velocity) at UTC datetime using SGP4.
 
@@ -188,15 +480,11 @@ def _compute_state_for_datetime(satrec: Satrec, when: datetime) -> Dict[str, Any
     else:
         when = when.astimezone(timezone.utc)
 
-    jd, fr = jday(
-        when.year,
-        when.month,
-        when.day,
-        when.hour,
-        when.minute,
-        when.second + when.microsecond / 1_000_000.0,
-    )
+    return _compute_state_for_jdfr(satrec, *_jday_utc(when))
+
 
+def _compute_state_for_jdfr(satrec: Satrec, jd: float, fr: float) -> Dict[str, Any]:
+    """`_compute_state_for_datetime` for a caller that already has (jd, fr)."""
     e, r, v = satrec.sgp4(jd, fr)
 
     return {
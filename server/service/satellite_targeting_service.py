@@ -1,8 +1,23 @@
 """Service for determining satellite targeting and connection feasibility."""
 import abc
+import functools
 from typing import Dict, Any, List, Optional, Tuple
 import math
 
+
+@functools.lru_cache(maxsize=128)
+def _enu_basis(lat_deg: float, lon_deg: float) -> Tuple[float, float, float, float]:
+    """(sin_lat, cos_lat, sin_lon, cos_lon) for an observer; ground stations
+    rarely move, so the trig is done once per position."""
+    lat = math.radians(lat_deg)
+    lon = math.radians(lon_deg)
+    return math.sin(lat), math.cos(lat), math.sin(lon), math.cos(lon)
+
+
+def _normalize_deg(angle_deg: float) -> float:
+    """Wrap any angle into [-180, 180)."""
+    return (angle_deg + 180.0) % 360.0 - 180.0
+
 class ISatelliteTargetingService(abc.ABC):
     @abc.abstractmethod
     def can_connect(self,
@@ -142,8 +157,8 @@ class SatelliteTargetingService(ISatelliteTargetingService):
         e, n, u = enu
 
         # Calculate range, elevation and azimuth
-        range_km = math.sqrt(sum(x*x for x in rel_vector))
-        horizontal_dist = math.sqrt(e*e + n*n)
+        range_km = math.hypot(*rel_vector)
+        horizontal_dist = math.hypot(e, n)
         elevation_deg = math.degrees(math.atan2(u, horizontal_dist))
         azimuth_deg = self._calculate_azimuth(e, n)
 
@@ -156,10 +171,8 @@ class SatelliteTargetingService(ISatelliteTargetingService):
         }
 
         if current_azimuth_deg is not None:
-            azimuth_diff = abs(azimuth_deg - current_azimuth_deg)
-            if azimuth_diff > 180:
-                azimuth_diff = 360 - azimuth_diff
-            result["azimuth_diff_deg"] = azimuth_diff
+            # Also correct for headings outside [0, 360), e.g. raw compass readings
+            result["azimuth_diff_deg"] = abs(_normalize_deg(azimuth_deg - current_azimuth_deg))
 
         if current_elevation_deg is not None:
             result["elevation_diff_deg"] = elevation_deg - current_elevation_deg
@@ -183,13 +196,7 @@ class SatelliteTargetingService(ISatelliteTargetingService):
         Returns:
             Vector in ENU frame [east, north, up]
         """
-        lat = math.radians(lat_deg)
-        lon = math.radians(lon_deg)
-
-        sin_lat = math.sin(lat)
-        cos_lat = math.cos(lat)
-        sin_lon = math.sin(lon)
-        cos_lon = math.cos(lon)
+        sin_lat, cos_lat, sin_lon, cos_lon = _enu_basis(lat_deg, lon_deg)
 
         # ECEF to ENU transformation matrix
         # First rotate by longitude around z-axis
@@ -218,7 +225,4 @@ class SatelliteTargetingService(ISatelliteTargetingService):
             Azimuth angle in degrees (0-360, 0=North, 90=East)
         """
         azimuth_rad = math.atan2(east, north)
-        azimuth_deg = math.degrees(azimuth_rad)
-        if azimuth_deg < 0:
-            azimuth_deg += 360
-        return azimuth_deg
\ No newline at end of file
+        return math.degrees(azimuth_rad) % 360.0
\ No newline at end of file
@@ -1,55 +1,152 @@
+import heapq
 import json
+import logging
+import logging.handlers
+import queue
 import threading
 import time
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from server.model.repository import ITleRepository
-from server.service.connection_manager import IConnectionManager, ConnectionManager
+from server.service.connection_manager import IConnectionManager, ConnectionManager, NotModified
+
+# Configured by the application; a running scheduler only routes its
+# records through a queue (see TleSchedulerService.start)
+logger = logging.getLogger("tle.scheduler")
+
+
+def _reachable_handlers(lg: logging.Logger) -> List[logging.Handler]:
+    """Handlers a record logged on `lg` would reach by propagation."""
+    handlers: List[logging.Handler] = []
+    while lg is not None:
+        handlers.extend(lg.handlers)
+        if not lg.propagate:
+            break
+        lg = lg.parent
+    return handlers
 
 class TleSchedulerService:
+    RETRY_MIN_S = 30
+    RETRY_MAX_S = 300
+    # Retry cadence after an unexpected (non-connectivity) error
+    ERROR_RETRY_S = 60
+
     def __init__(self, repo: ITleRepository, tle_group: str,
                  interval_seconds: int = 3600,
-                 connection_manager: Optional[IConnectionManager] = None):
+                 connection_manager: Optional[IConnectionManager] = None,
+                 on_refresh: Optional[Callable[[], None]] = None):
         self.repo = repo
         self.tle_group = tle_group
         self.interval = interval_seconds
         self._stop_event = threading.Event()
+        # Set by stop() and add_group() to cut the current wait short
+        self._wakeup = threading.Event()
         self._thread = None
-        self._last_fetch_time = None
         self._conn_manager = connection_manager or ConnectionManager()
+        # Every group shares this one thread: a min-heap of (next due, group),
+        # so the thread only wakes when the earliest group is due. Due times
+        # are time.monotonic() seconds, immune to NTP/RTC steps of the wall clock.
+        self._lock = threading.Lock()
+        self._schedule: List[Tuple[float, str]] = []
+        self._intervals: Dict[str, int] = {}
+        # After a failed fetch (no connectivity) a group waits this long before
+        # its next attempt, doubling per failure up to RETRY_MAX_S
+        self._retry_delay: Dict[str, int] = {}
+        # Called on the scheduler thread after each successful fetch, e.g. to
+        # rebuild precomputed satellite states off the request path.
+        self._on_refresh = on_refresh
+        # Set once the first fetch has been stored, so callers can wait on it
+        # instead of sleeping or polling the repository.
+        self.initial_fetch_done = threading.Event()
+        # While running, records go through a queue to a listener thread, so
+        # the scheduler never blocks on a slow log handler
+        self._log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._log_handler: Optional[logging.handlers.QueueHandler] = None
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
+        self._log_propagate = logger.propagate
+        self.add_group(tle_group, interval_seconds)
+
+    def add_group(self, group: str, interval_seconds: Optional[int] = None):
+        """Fetch another TLE group on this scheduler's thread.
+
+        The group is due immediately and then every `interval_seconds`
+        (default: the scheduler's own interval). Re-adding a group only
+        changes its interval.
+        """
+        with self._lock:
+            known = group in self._intervals
+            self._intervals[group] = interval_seconds or self.interval
+            if not known:
+                self._retry_delay[group] = 0
+                heapq.heappush(self._schedule, (time.monotonic(), group))
+        self._wakeup.set()
+
+    def _notify_refresh(self):
+        self.initial_fetch_done.set()
+        if self._on_refresh is None:
+            return
+        try:
+            self._on_refresh()
+        except Exception:
+            logger.exception("Refresh callback failed")
+
+    def _fetch_group(self, group: str) -> float:
+        """Fetch and store one group; returns when it is next due."""
+        try:
+            # No separate connectivity probe; a failed fetch raises ConnectionError
+            from server.model.repository import TleRepositoryUtils
+            TleRepositoryUtils.fetch_and_store_group(self.repo, group, timeout=20)
+        except NotModified:
+            pass  # Group unchanged since the last fetch: nothing to parse or store
+        except ConnectionError as e:
+            delay = min(max(self.RETRY_MIN_S, self._retry_delay[group] * 2), self.RETRY_MAX_S)
+            self._retry_delay[group] = delay
+            logger.warning("No connection available (%s); retrying %s in %ss", e, group, delay)
+            return time.monotonic() + delay
+        except Exception:
+            logger.exception("Error in scheduler loop")
+            return time.monotonic() + self.ERROR_RETRY_S
+        self._retry_delay[group] = 0
+        self._notify_refresh()
+        return time.monotonic() + self._intervals[group]
 
     def _run(self):
         while not self._stop_event.is_set():
-            now = datetime.now()
-            # If never fetched or it's been more than interval, try to fetch
-            if (self._last_fetch_time is None or
-                (now - self._last_fetch_time) >= timedelta(seconds=self.interval)):
-                try:
-                    if self._conn_manager.is_available():
-                        # Use TleRepositoryUtils for the high-level fetch and store operation
-                        from server.model.repository import TleRepositoryUtils
-                        TleRepositoryUtils.fetch_and_store_group(self.repo, self.tle_group, timeout=20)
-                        self._last_fetch_time = datetime.now()
-                    else:
-                        status = self._conn_manager.get_connection_status()
-                        print(f"[TleSchedulerService] No connection available. Status: {status}")
-                except Exception as e:
-                    print(f"[TleSchedulerService] Error in scheduler loop: {e}")
-            # Sleep in short intervals to allow quick recovery after connection returns
-            time.sleep(60)
+            with self._lock:
+                due, group = self._schedule[0] if self._schedule else (None, None)
+            delay = None if due is None else due - time.monotonic()
+            if delay is None or delay > 0:
+                # Sleep until the earliest group is due; stop()/add_group() wake us at once
+                self._wakeup.wait(timeout=delay)
+                self._wakeup.clear()
+                continue
+            with self._lock:
+                heapq.heappop(self._schedule)
+            next_due = self._fetch_group(group)
+            with self._lock:
+                heapq.heappush(self._schedule, (next_due, group))
 
     def _do_initial_fetch(self):
         """Performs initial data fetch when service starts."""
-        print("[TleSchedulerService] Performing initial data fetch...")
-        try:
-            from server.model.repository import TleRepositoryUtils
-            TleRepositoryUtils.fetch_and_store_group(self.repo, self.tle_group, timeout=20)
-            self._last_fetch_time = datetime.now()
-        except Exception as e:
-            print(f"[TleSchedulerService] Warning: Could not fetch new data: {e}")
-            print("[TleSchedulerService] Will use existing data from database")
-            self._last_fetch_time = None  # Force a retry on next scheduler loop
+        logger.info("Performing initial data fetch...")
+        with self._lock:
+            pending, self._schedule = self._schedule, []
+        from server.model.repository import TleRepositoryUtils
+        for due, group in sorted(pending):
+            try:
+                TleRepositoryUtils.fetch_and_store_group(self.repo, group, timeout=20)
+                due = time.monotonic() + self._intervals[group]
+                self._notify_refresh()
+            except NotModified:
+                # Restarted with the stored copy still current
+                due = time.monotonic() + self._intervals[group]
+                self._notify_refresh()
+            except Exception as e:
+                logger.warning("Could not fetch new data: %s", e)
+                logger.warning("Will use existing data from database")
+                # `due` unchanged: retried on the first scheduler loop
+            with self._lock:
+                heapq.heappush(self._schedule, (due, group))
 
     def start(self, initial_fetch=True):
         """Start the scheduler service.
@@ -58,6 +155,9 @@ class TleSchedulerService:
             initial_fetch (bool): If True, performs immediate data fetch
         """
         if self._thread is None or not self._thread.is_alive():
+            if self._log_listener is None:
+                self._start_logging()
+
             # Do initial fetch if requested
             if initial_fetch:
                 self._do_initial_fetch()
@@ -65,10 +165,34 @@ class TleSchedulerService:
             self._stop_event.clear()
             self._thread = threading.Thread(target=self._run, daemon=True)
             self._thread.start()
-            print("[TleSchedulerService] Scheduler started.")
+            logger.info("Scheduler started.")
 
     def stop(self):
         self._stop_event.set()
+        self._wakeup.set()
         if self._thread:
             self._thread.join()
-            print("[TleSchedulerService] Scheduler stopped.")
+            logger.info("Scheduler stopped.")
+        if self._log_listener is not None:
+            self._stop_logging()
+
+    def _start_logging(self):
+        # The listener writes through the handlers the application set up for
+        # these records (with their own levels). While it runs, those handlers
+        # are reached via the queue instead of by propagation, so nothing is
+        # written twice; _stop_logging restores the caller's setting.
+        handlers = _reachable_handlers(logger) or [logging.lastResort]
+        self._log_listener = logging.handlers.QueueListener(
+            self._log_queue, *handlers, respect_handler_level=True)
+        self._log_handler = logging.handlers.QueueHandler(self._log_queue)
+        self._log_propagate = logger.propagate
+        logger.addHandler(self._log_handler)
+        logger.propagate = False
+        self._log_listener.start()
+
+    def _stop_logging(self):
+        logger.removeHandler(self._log_handler)
+        logger.propagate = self._log_propagate
+        self._log_listener.stop()  # flushes whatever is still queued
+        self._log_handler = None
+        self._log_listener = None